@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import io
-from functools import cache
 from pathlib import Path
 from typing import MutableMapping, TextIO, cast
 
@@ -20,8 +19,10 @@ class Base:
         stdin: TextIO,
         stdout: TextIO,
         stderr: TextIO,
+        repo: Repository | None = None,
     ):
         self.dir: Path = _dir
+        self._repo: Repository | None = repo
         self.env: MutableMapping[str, str] = env
         self.args: list[str] = args
         self.stdin: TextIO = stdin
@@ -32,9 +33,10 @@ class Base:
         self.pager: Pager | None = None
 
     @property
-    @cache
     def repo(self) -> Repository:
-        return Repository(self.dir / ".git")
+        if self._repo is None:
+            self._repo = Repository(self.dir / ".git")
+        return self._repo
 
     def setup_pager(self) -> None:
         if self.pager is not None:
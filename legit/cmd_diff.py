@@ -47,6 +47,8 @@ class Diff(PrintDiffMixin, Base):
         if not self.patch:
             return
 
+        self.status_state.ensure_head_diff()
+
         for path, state in self.status_state.index_changes.items():
             if state == "modified":
                 self.print_diff(self.from_head(Path(path)), self.from_index(Path(path)))
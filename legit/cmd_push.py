@@ -121,7 +121,7 @@ class Push(FastForwardMixin, RemoteClientMixin, SendObjectsMixin, Base):
         for target, (source, forced) in targets.items():
             self.select_update(target, source, forced)
 
-        log.debug(f"About to send updates. self.updates contains: {self.updates}")
+        log.debug("About to send updates. self.updates contains: %s", self.updates)
 
         for ref, values in self.updates.items():
             *_, old, new = values
@@ -178,7 +178,7 @@ class Push(FastForwardMixin, RemoteClientMixin, SendObjectsMixin, Base):
         self.send_packed_objects(revs)
 
     def print_summary(self) -> None:
-        log.debug(f"About to print summary. self.updates contains: {self.updates}")
+        log.debug("About to print summary. self.updates contains: %s", self.updates)
         if not self.updates and not self.errors:
             self.stderr.write("Everything up-to-date\n")
         else:
@@ -69,13 +69,13 @@ class ReceivePack(FastForwardMixin, RecvObjectsMixin, RemoteAgentMixin, Base):
                 self.conn.send_packet(line.encode())
 
     def update_refs(self) -> None:
-        log.debug(f"update refs called, {self.requests=}")
+        log.debug("update refs called, self.requests=%r", self.requests)
         for ref, (old, new) in self.requests.items():
             self.update_ref(ref, cast(str, old), cast(str, new))
         self.report_status(None)
 
     def update_ref(self, ref: str, old: str, new: str) -> None:
-        log.debug(f"{ref}, {type(ref)}")
+        log.debug("%s, %s", ref, type(ref))
         if self.unpack_error:
             return self.report_status(f"ng {ref} unpacker error")
 
@@ -56,6 +56,7 @@ class StatusCmd(Base):
     def run(self) -> None:
         self.repo.index.load_for_update()
         self.status_state = self.repo.status()
+        self.status_state.ensure_head_diff()
         self.repo.index.write_updates()
 
         self.print_results()
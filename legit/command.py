@@ -27,6 +27,7 @@ from legit.cmd_revert import Revert
 from legit.cmd_rm import Rm
 from legit.cmd_status import StatusCmd
 from legit.cmd_upload_pack import UploadPack
+from legit.repository import Repository
 
 
 class Command:
@@ -63,10 +64,11 @@ class Command:
         stdin: TextIO,
         stdout: TextIO,
         stderr: TextIO,
+        repo: Repository | None = None,
     ) -> Base:
-        from legit.setup_logging import setup_logging
+        from legit.setup_logging import LOG_LEVEL_ENV, setup_logging
 
-        setup_logging(level="DEBUG", log_file="/tmp/legit.log")
+        setup_logging(level=env.get(LOG_LEVEL_ENV), log_file="/tmp/legit.log")
 
         name = argv[1]
         args = argv[2:]
@@ -75,7 +77,7 @@ class Command:
             raise Command.Unknown(f"{name} is not a legit command")
 
         cmd_class = Command.COMMANDS[name]
-        cmd: Base = cmd_class(_dir, env, args, stdin, stdout, stderr)
+        cmd: Base = cmd_class(_dir, env, args, stdin, stdout, stderr, repo)
         cmd.execute()
 
         return cmd
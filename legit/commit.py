@@ -8,6 +8,8 @@ from legit.author import Author
 
 
 class Commit:
+    __slots__ = ("_oid", "author", "committer", "message", "parents", "tree")
+
     def __init__(
         self,
         parents: list[str],
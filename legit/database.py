@@ -1,8 +1,7 @@
 from __future__ import annotations
 
 import hashlib
-import random
-import string
+from collections.abc import Iterable
 from pathlib import Path
 from typing import MutableMapping, Optional, Type, cast
 
@@ -42,6 +41,9 @@ class Database:
         self.objects: MutableMapping[str, Blob | Commit | Tree] = {}
         self.backend = Backends(self.path)
 
+    def reload(self) -> None:
+        self.backend.reload()
+
     def has(self, oid: str) -> bool:
         return self.backend.has(oid)
 
@@ -54,7 +56,7 @@ class Database:
     def prefix_match(self, name: str) -> list[str]:
         return self.backend.prefix_match(name)
 
-    def write_object(self, oid: str, content: bytes) -> None:
+    def write_object(self, oid: str, content: bytes | bytearray) -> None:
         return self.backend.write_object(oid, content)
 
     @property
@@ -78,10 +80,18 @@ class Database:
         return diff.changes
 
     def load(self, oid: str) -> Blob | Commit | Tree | Record:
-        obj = self.read_object(oid)
-        self.objects[oid] = obj
+        # Objects are addressed by their content, so a loaded one never goes stale.
+        obj = self.objects.get(oid)
+        if obj is None:
+            obj = self.read_object(oid)
+            self.objects[oid] = obj
         return obj
 
+    def load_many(
+        self, oids: Iterable[str]
+    ) -> dict[str, Blob | Commit | Tree | Record]:
+        return {oid: self.load(oid) for oid in sorted(set(oids))}
+
     def load_tree_entry(
         self, oid: str, path: Optional[Path]
     ) -> DatabaseEntry | Entry | Tree | None:
@@ -140,22 +150,36 @@ class Database:
 
         self.write_object(obj.oid, content)
 
+    def store_many(self, objs: Iterable[Blob | Commit | Tree | Record]) -> None:
+        contents: dict[str, bytes | bytearray] = {}
+        for obj in objs:
+            content = self.serialize_object(obj)
+            obj.oid = self.hash_content(content)
+            contents.setdefault(obj.oid, content)
+
+        for oid, content in contents.items():
+            self.write_object(oid, content)
+
     def hash_object(self, obj: Blob | Commit | Tree | Record) -> str:
         return self.hash_content(self.serialize_object(obj))
 
-    def serialize_object(self, obj: Blob | Commit | Tree | Record) -> bytes:
+    def serialize_object(self, obj: Blob | Commit | Tree | Record) -> bytes | bytearray:
+        if isinstance(obj, Tree):
+            return self.serialize_tree(obj)
+
         string = cast(bytes, obj.to_bytes())
         header = f"{obj.type()} {len(string)}".encode("utf-8") + b"\x00"
 
         return header + string
 
-    def hash_content(self, content: bytes) -> str:
+    def serialize_tree(self, tree: Tree) -> bytearray:
+        data = bytearray()
+        tree.write_to(data.extend)
+        data[0:0] = f"{tree.type()} {len(data)}".encode() + b"\x00"
+        return data
+
+    def hash_content(self, content: bytes | bytearray) -> str:
         return hashlib.sha1(content).hexdigest()
 
     def short_oid(self, oid: str) -> str:
         return oid[:7]
-
-    def generate_temp_name(self) -> str:
-        return "tmp_obj_" + "".join(
-            random.choices(string.ascii_letters + string.digits, k=6)
-        )
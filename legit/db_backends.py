@@ -18,10 +18,15 @@ class Backends:
         for store in self.stores:
             store.close()
 
+    def reload(self) -> None:
+        for store in self.stores[1:]:
+            store.close()
+        self.stores = [self.loose] + self.packed()
+
     def __del__(self) -> None:
         self.close()
 
-    def write_object(self, oid: str, content: bytes) -> None:
+    def write_object(self, oid: str, content: bytes | bytearray) -> None:
         return self.loose.write_object(oid, content)
 
     @property
@@ -6,9 +6,10 @@ from typing import Any
 class DatabaseEntry:
     TREE_MODE = 0o40000
 
-    def __init__(self, oid: str, mode: int) -> None:
+    def __init__(self, oid: str, mode: int, raw_oid: bytes | None = None) -> None:
         self.oid: str = oid
         self.mode: int = mode
+        self.raw_oid: bytes = raw_oid if raw_oid is not None else bytes.fromhex(oid)
 
     def is_tree(self) -> bool:
         return self.mode == DatabaseEntry.TREE_MODE
@@ -63,7 +63,7 @@ class Loose:
 
         return [oid for oid in oids if oid.startswith(name)]
 
-    def write_object(self, oid: str, content: bytes) -> None:
+    def write_object(self, oid: str, content: bytes | bytearray) -> None:
         object_path: Path = self.path / str(oid[:2]) / str(oid[2:])
         if object_path.exists():
             return
@@ -14,6 +14,7 @@ from typing import (
 
 from legit.db_entry import DatabaseEntry
 from legit.lockfile import Lockfile
+from legit.racy import is_racy
 
 
 @runtime_checkable
@@ -42,6 +43,9 @@ class Index:
         self.digest: Hash | None = None
         self.changed: bool = False
         self.parents: dict[Path, set[Path]] = defaultdict(set)
+        self.is_sorted: bool = True
+        self.stat_key: tuple[int, int, int, int] | None = None
+        self.conflicts: set[Entry] | None = None
 
     def conflict_paths(self) -> set["Entry"]:
         paths = set()
@@ -50,6 +54,11 @@ class Index:
                 paths.add(entry)
         return paths
 
+    def conflict_paths_cached(self) -> set[Entry]:
+        if self.conflicts is None:
+            self.conflicts = self.conflict_paths()
+        return self.conflicts
+
     def add_from_db(self, path: Path, item: DatabaseEntry) -> None:
         self.store_entry(Entry.create_from_db(path, item, 0))
         self.changed = True
@@ -88,6 +97,9 @@ class Index:
                 return True
         return False
 
+    def tracked_file_paths(self) -> set[Path]:
+        return {path for path, _ in self.entries}
+
     def is_tracked(self, path: Path) -> bool:
         return self.is_tracked_file(path) or path in self.parents
 
@@ -124,6 +136,7 @@ class Index:
             return
 
         self.entries.pop(entry.key(), None)
+        self.conflicts = None
 
         for dirname in entry.parent_directories():
             paths = self.parents.get(dirname)
@@ -144,6 +157,8 @@ class Index:
             self.remove_entry(child)
 
     def write_updates(self) -> None:
+        self.conflicts = None
+
         if not self.changed:
             return self.lockfile.rollback()
 
@@ -155,8 +170,8 @@ class Index:
         )
         writer.write(header)
 
-        for _, v in sorted(self.entries.items()):
-            writer.write(v.to_bytes())
+        for entry in self.sorted_entries():
+            writer.write(entry.to_bytes())
 
         writer.write_checksum()
         self.lockfile.commit()
@@ -168,6 +183,10 @@ class Index:
         self.load()
 
     def load(self) -> None:
+        stat_result = self.stat_index_file()
+        if stat_result is not None and self.is_fresh(stat_result):
+            return
+
         self._clear()
 
         file = self.open_index_file()
@@ -180,6 +199,26 @@ class Index:
 
             file.close()
 
+        if stat_result is not None and not self.is_racy(stat_result):
+            self.stat_key = Index.key_for_stat(stat_result)
+
+    def is_fresh(self, stat_result: os.stat_result) -> bool:
+        if self.changed or self.stat_key is None:
+            return False
+        return self.stat_key == Index.key_for_stat(stat_result)
+
+    def is_racy(self, stat_result: os.stat_result) -> bool:
+        return is_racy(stat_result.st_mtime_ns)
+
+    @staticmethod
+    def key_for_stat(stat_result: os.stat_result) -> tuple[int, int, int, int]:
+        return (
+            stat_result.st_ino,
+            stat_result.st_size,
+            stat_result.st_mtime_ns,
+            stat_result.st_ctime_ns,
+        )
+
     def clear(self) -> None:
         self._clear()
         self.changed = True
@@ -188,6 +227,9 @@ class Index:
         self.entries = {}
         self.changed = False
         self.parents = defaultdict(set)
+        self.is_sorted = True
+        self.stat_key = None
+        self.conflicts = None
 
     def open_index_file(self) -> BinaryIO | None:
         try:
@@ -195,6 +237,12 @@ class Index:
         except FileNotFoundError:
             return None
 
+    def stat_index_file(self) -> os.stat_result | None:
+        try:
+            return os.stat(self.path)
+        except FileNotFoundError:
+            return None
+
     def read_header(self, reader: "Checksum") -> int:
         data = reader.read(Index.HEADER_SIZE)
 
@@ -221,8 +269,19 @@ class Index:
 
             self.store_entry(Entry.parse(entry))
 
+    def sorted_entries(self) -> list[Entry]:
+        if not self.is_sorted:
+            self.entries = dict(sorted(self.entries.items()))
+            self.is_sorted = True
+        return list(self.entries.values())
+
     def store_entry(self, entry: "Entry") -> None:
-        self.entries[entry.key()] = entry
+        key = entry.key()
+        if self.is_sorted and self.entries and key not in self.entries:
+            self.is_sorted = key > next(reversed(self.entries))
+
+        self.entries[key] = entry
+        self.conflicts = None
         for dirname in entry.parent_directories():
             self.parents[dirname].add(entry.path)
 
@@ -263,6 +322,7 @@ class Entry:
         oid: str,
         flags: int,
         path: Path,
+        raw_oid: bytes | None = None,
     ):
         self.ctime = ctime
         self.ctime_nsec = ctime_nsec
@@ -275,14 +335,18 @@ class Entry:
         self.gid = gid
         self.size = size
         self.oid = oid
+        self.raw_oid = raw_oid if raw_oid is not None else bytes.fromhex(oid)
         self.flags = flags
         self.path = path
+        self.path_str = str(path)
 
     @classmethod
     def create_from_db(cls, path: Path, item: DatabaseEntry, n: int) -> "Entry":
         p = str(path)
         flags = (n << 12) | min(len(p), Entry.MAX_PATH_SIZE)
-        return cls(0, 0, 0, 0, 0, 0, item.mode, 0, 0, 0, item.oid, flags, path)
+        return cls(
+            0, 0, 0, 0, 0, 0, item.mode, 0, 0, 0, item.oid, flags, path, item.raw_oid
+        )
 
     @property
     def stage(self) -> int:
@@ -368,6 +432,7 @@ class Entry:
             oid_hex,
             flags,
             path,
+            oid_bytes,
         )
 
     @classmethod
@@ -395,8 +460,6 @@ class Entry:
         )
 
     def to_bytes(self) -> bytes:
-        import binascii
-
         header = struct.pack(
             "!10I",
             _u32(int(self.ctime)),
@@ -411,13 +474,11 @@ class Entry:
             _u32(self.size),
         )
 
-        oid_bytes = binascii.unhexlify(self.oid)
-
         flags = struct.pack("!H", self.flags)
 
         path_bytes = str(self.path).encode("utf-8") + b"\x00"
 
-        result = header + oid_bytes + flags + path_bytes
+        result = header + self.raw_oid + flags + path_bytes
 
         while len(result) % Entry.ENTRY_BLOCK != 0:
             result += b"\x00"
@@ -18,7 +18,11 @@ class Inspector:
         self.repo: Repository = repo
 
     def compare_index_to_workspace(
-        self, entry: Optional[Entry], stat: os.stat_result | None
+        self,
+        entry: Entry | None,
+        stat: os.stat_result | None,
+        oid: str | None = None,
+        size_match: bool | None = None,
     ) -> Optional[str]:
         if entry is None:
             return "untracked"
@@ -32,15 +36,33 @@ class Inspector:
         if entry.times_match(stat):
             return None
 
-        data = self.repo.workspace.read_file(entry.path)
-        blob = Blob(data)
-        oid = self.repo.database.hash_object(blob)
+        if size_match is None:
+            size_match = self.size_match(entry, stat)
+
+        if not size_match:
+            return "modified"
+
+        if oid is None:
+            oid = self.hash_workspace_file(entry.path)
 
         if entry.oid != oid:
             return "modified"
 
         return None
 
+    def size_match(self, entry: Entry, stat: os.stat_result) -> bool:
+        # An empty file is hashed anyway, which costs less than reading the
+        # object header to learn the blob size.
+        if entry.size != 0 or stat.st_size == 0:
+            return True
+
+        info = self.repo.database.load_info(entry.oid)
+        return info is None or info.size == stat.st_size
+
+    def hash_workspace_file(self, path: Path) -> str:
+        data = self.repo.workspace.read_file(path)
+        return self.repo.database.hash_object(Blob(data))
+
     def compare_tree_to_index(
         self, item: Optional[DatabaseEntry], entry: Optional[Entry]
     ) -> Optional[str]:
@@ -50,6 +50,7 @@ class Migration:
         }
         self.mkdirs: Set[Path] = set()
         self.rmdirs: Set[Path] = set()
+        self.blocking_files: set[Path] = set()
 
         self.errors: List[str] = []
         self.inspector: Inspector = Inspector(repo)
@@ -61,9 +62,13 @@ class Migration:
         }
 
     def apply_changes(self) -> None:
-        self.plan_changes()
-        self.update_workspace()
-        self.update_index()
+        self.repo.workspace.enable_stat_cache()
+        try:
+            self.plan_changes()
+            self.update_workspace()
+            self.update_index()
+        finally:
+            self.repo.workspace.disable_stat_cache()
 
     def blob_data(self, oid: str) -> bytes:
         blob = self.repo.database.load(oid)
@@ -96,16 +101,29 @@ class Migration:
 
         if old_item is None:
             self.mkdirs.update(dir_chain)
+            self.record_blocking_file(path)
             action = "create"
         elif new_item is None:
             self.rmdirs.update(dir_chain)
             action = "delete"
         else:
             self.mkdirs.update(dir_chain)
+            self.record_blocking_file(path)
             action = "update"
 
         self.changes[action].append((path, new_item))
 
+    def record_blocking_file(self, path: Path) -> None:
+        for parent in reversed(path.parents):
+            if str(parent) == ".":
+                continue
+            if parent in self.blocking_files:
+                return
+            if self._is_file(self.repo.workspace.stat_file(parent)):
+                self.blocking_files.add(parent)
+                self.changes["delete"].append((parent, None))
+                return
+
     def check_for_conflict(
         self,
         path: Path,
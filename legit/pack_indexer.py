@@ -194,9 +194,11 @@ class Indexer:
 
 
 class PackFile:
+    BUFFER_SIZE: int = 2 * 1024 * 1024
+
     def __init__(self, pack_dir: Path, name: str) -> None:
         pack_dir.mkdir(exist_ok=True, parents=True)
-        self.file = TempFile(pack_dir, name)
+        self.file = TempFile(pack_dir, name, PackFile.BUFFER_SIZE)
         self.digest = hashlib.sha1()
 
     def write(self, data: bytes) -> None:
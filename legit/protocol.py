@@ -27,7 +27,8 @@ class Remotes:
             return self.caps_remote is not None and ability in self.caps_remote
 
         def send_packet(self, line: Optional[str | bytes]) -> None:
-            log.debug(f"send_packet got {line!r} to transmit")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("send_packet got %r to transmit", line)
             if line is None:
                 self.output.write(b"0000")
                 self.output.flush()
@@ -49,7 +50,8 @@ class Remotes:
 
         def recv_packet(self) -> bytes | None:
             head = self.input.read(4)
-            log.debug(f"recv_packet read: {head!r}")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("recv_packet read: %r", head)
 
             if not head:
                 return None
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+import time
+
+# A file written again within the same timestamp tick keeps its mtime, so a
+# cached result is only trusted once its mtime is older than this window.
+RACY_WINDOW_NS: int = 1_000_000_000
+
+
+def is_racy(mtime_ns: int) -> bool:
+    return mtime_ns > time.time_ns() - RACY_WINDOW_NS
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import os
 import re
 from collections import defaultdict
 from pathlib import Path
 from typing import Any, Callable, Optional, Pattern
 
 from legit.lockfile import Lockfile
+from legit.racy import is_racy
 
 INVALID_NAME = re.compile(
     r"""
@@ -83,6 +85,7 @@ class Refs:
         self.refs_path: Path = self.path / self.REFS_DIR
         self.heads_path: Path = self.path / self.HEADS_DIR
         self.remotes_path: Path = self.path / self.REMOTES_DIR
+        self.dir_cache: dict[Path, tuple[int, list[tuple[str, bool]]]] = {}
 
     def reverse_refs(self) -> dict[str, list["Refs.Ref | Refs.SymRef"]]:
         table: dict[str, list["Refs.Ref | Refs.SymRef"]] = defaultdict(list)
@@ -127,20 +130,39 @@ class Refs:
         return self.list_refs(self.heads_path)
 
     def list_refs(self, dirname: Path) -> list["Refs.SymRef"]:
-        try:
-            entries = list(dirname.iterdir())
-        except FileNotFoundError:
-            return []
+        entries = self.list_dir_cached(dirname)
 
         refs: list["Refs.SymRef"] = []
-        for path in entries:
-            if path.is_dir():
+        for name, is_dir in entries:
+            path = dirname / name
+            if is_dir:
                 refs.extend(self.list_refs(path))
             else:
                 rel_path = path.relative_to(self.path)
                 refs.append(Refs.SymRef(self, str(rel_path)))
         return refs
 
+    def list_dir_cached(self, dirname: Path) -> list[tuple[str, bool]]:
+        try:
+            mtime = os.stat(dirname).st_mtime_ns
+        except FileNotFoundError:
+            self.dir_cache.pop(dirname, None)
+            return []
+
+        cached = self.dir_cache.get(dirname)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with os.scandir(dirname) as it:
+                entries = [(entry.name, entry.is_dir()) for entry in it]
+        except FileNotFoundError:
+            return []
+
+        if not is_racy(mtime):
+            self.dir_cache[dirname] = (mtime, entries)
+        return entries
+
     def current_ref(self, source: str = "HEAD") -> "Refs.SymRef":
         ref = self.read_oid_or_symref(self.path / source)
 
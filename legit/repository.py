@@ -64,6 +64,7 @@ class HardReset:
 
     def execute(self) -> None:
         self.status = self.repo.status(self.oid)
+        self.status.ensure_head_diff()
         changed = [Path(path) for path in self.status.changed]
 
         for path in changed:
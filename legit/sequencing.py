@@ -118,11 +118,13 @@ class SequencingMixin:
 
         self.repo.pending_commit().start(inputs.right_oid, self.merge_type())
 
+        conflicts = list(self.repo.index.conflict_paths_cached())
+
         def editor_setup(editor: Editor) -> None:
             editor.println(message)
             editor.println("")
             editor.note("Conflicts:")
-            for name in self.repo.index.conflict_paths():
+            for name in conflicts:
                 editor.note(f"\t{name}")
             editor.close()
 
@@ -2,18 +2,29 @@ from __future__ import annotations
 
 import logging
 import sys
+from logging.handlers import MemoryHandler
 from pathlib import Path
 
-LOG_LEVEL = logging.DEBUG
+LOG_LEVEL = logging.WARNING
+LOG_LEVEL_ENV = "LEGIT_LOG_LEVEL"
 LOG_FORMAT = "%(asctime)s  %(levelname)-8s  %(name)s:%(lineno)d  →  %(message)s"
+LOG_BUFFER_CAPACITY = 8192
+
+
+def resolve_level(level: int | str | None) -> int:
+    if level is None:
+        return LOG_LEVEL
+    if isinstance(level, int):
+        return level
+    # An unknown name, e.g. a typo in LEGIT_LOG_LEVEL, must not break commands.
+    return logging.getLevelNamesMapping().get(level.upper(), LOG_LEVEL)
 
 
 def setup_logging(
-    level: int | str = LOG_LEVEL,
+    level: int | str | None = None,
     log_file: str | Path | None = None,
 ) -> None:
-    if isinstance(level, str):
-        level = level.upper()
+    level = resolve_level(level)
 
     root = logging.getLogger()
     root.setLevel(level)
@@ -22,18 +33,35 @@ def setup_logging(
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
 
-        file_handler = logging.FileHandler(log_path, mode="w", encoding="utf-8")
-        file_handler.setLevel(level)
+        memory_handler = next(
+            (
+                h
+                for h in root.handlers
+                if isinstance(h, MemoryHandler)
+                and isinstance(h.target, logging.FileHandler)
+                and h.target.baseFilename == str(log_path.resolve())
+            ),
+            None,
+        )
+
+        if memory_handler is None:
+            file_handler = logging.FileHandler(log_path, mode="w", encoding="utf-8")
+
+            formatter = logging.Formatter(LOG_FORMAT, datefmt="%Y-%m-%d %H:%M:%S")
+            file_handler.setFormatter(formatter)
 
-        formatter = logging.Formatter(LOG_FORMAT, datefmt="%Y-%m-%d %H:%M:%S")
-        file_handler.setFormatter(formatter)
+            memory_handler = MemoryHandler(
+                LOG_BUFFER_CAPACITY,
+                flushLevel=logging.ERROR,
+                target=file_handler,
+                flushOnClose=True,
+            )
+            root.addHandler(memory_handler)
 
-        if not any(
-            isinstance(h, logging.FileHandler)
-            and h.baseFilename == str(log_path.resolve())
-            for h in root.handlers
-        ):
-            root.addHandler(file_handler)
+        # Later calls may ask for a different level, so apply it every time.
+        memory_handler.setLevel(level)
+        assert memory_handler.target is not None
+        memory_handler.target.setLevel(level)
 
     if not root.handlers:
         logging.basicConfig(
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import os
-from collections import defaultdict
+from collections import defaultdict, deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 from typing import (
     TYPE_CHECKING,
@@ -10,17 +13,20 @@ from typing import (
     cast,
 )
 
-from legit.blob import Blob
+from legit.commit import Commit
 from legit.db_entry import DatabaseEntry
 from legit.index import Entry
 from legit.inspector import Inspector
 from legit.tree import Tree
+from legit.workspace import Workspace
 
 if TYPE_CHECKING:
     from legit.repository import Repository
 
 
 class Status:
+    PARALLEL_HASH_MIN: int = 32
+
     def __init__(self, repo: Repository, commit_oid: Optional[str] = None) -> None:
         self.inspector: Inspector = Inspector(repo)
         self.repo = repo
@@ -30,49 +36,118 @@ class Status:
         self.changed: set[str] = set()
         self.untracked: set[str] = set()
         self.conflicts: defaultdict[str, list[int]] = defaultdict(list[int])
+        self.size_matches: dict[Path, bool] = {}
+
+        self.head_diffed: bool = False
 
         if commit_oid is None:
             commit_oid = self.repo.refs.read_head()
-
-        self.head_tree = self.repo.database.load_tree_list(commit_oid)
+        self.commit_oid: str | None = commit_oid
 
         self.scan_workspace()
         self.check_index_entries()
+
+    @cached_property
+    def head_tree(self) -> dict[Path, DatabaseEntry | Entry | Tree | None]:
+        if self.commit_oid is None:
+            return {}
+
+        commit = self.repo.database.load(self.commit_oid)
+        assert isinstance(commit, Commit)
+        return dict(self.read_tree(commit.tree))
+
+    def ensure_head_diff(self) -> None:
+        if self.head_diffed:
+            return
+
+        for entry in self.repo.index.entries.values():
+            if entry.stage == 0:
+                self.check_index_against_head_tree(entry)
+
         self.collect_deleted_head_files()
+        self.head_diffed = True
 
     def collect_deleted_head_files(self) -> None:
+        tracked = self.repo.index.tracked_file_paths()
         for path in self.head_tree.keys():
-            if not self.repo.index.is_tracked_file(path):
-                self.record_change(path, self.index_changes, "deleted")
+            if path not in tracked:
+                self.record_change(str(path), self.index_changes, "deleted")
+
+    def read_tree(
+        self, tree_oid: str, pathname: str = ""
+    ) -> Iterator[tuple[Path, DatabaseEntry]]:
+        root = self.repo.database.load(tree_oid)
+        assert isinstance(root, Tree)
+        stack = [(pathname, self.tree_items(root))]
+
+        while stack:
+            prefix, items = stack[-1]
+            for name, entry, subtree in items:
+                path = f"{prefix}/{name}" if prefix else name
+                if subtree is not None:
+                    stack.append((path, self.tree_items(subtree)))
+                    break
+                yield Path(path), entry
+            else:
+                stack.pop()
 
-    def read_tree(self, tree_oid: str, pathname: str = "") -> None:
-        tree = self.repo.database.load(tree_oid)
-        assert isinstance(tree, Tree)
+    def tree_items(
+        self, tree: Tree
+    ) -> Iterator[tuple[str, DatabaseEntry, Tree | None]]:
+        subtrees = self.repo.database.load_many(
+            entry.oid
+            for entry in tree.entries.values()
+            if isinstance(entry, DatabaseEntry) and entry.is_tree()
+        )
 
         for name, entry in tree.entries.items():
-            path = Path(pathname) / name
             assert isinstance(entry, DatabaseEntry)
-            if entry.is_tree():
-                self.read_tree(entry.oid, str(path))
-            else:
-                self.head_tree[path] = entry
+            subtree = subtrees.get(entry.oid) if entry.is_tree() else None
+            assert subtree is None or isinstance(subtree, Tree)
+            yield name, entry, subtree
 
     def check_index_entries(self) -> None:
+        oids = self.preload_workspace_oids()
+
         for name, entry in self.repo.index.entries.items():
             if entry.stage == 0:
-                self.check_index_against_workspace(entry)
-                self.check_index_against_head_tree(entry)
+                self.check_index_against_workspace(entry, oids.get(entry.path))
             else:
-                self.changed.add(str(entry.path))
-                self.conflicts[str(entry.path)].append(entry.stage)
-
-    def check_index_against_workspace(self, entry: Entry) -> None:
+                self.changed.add(entry.path_str)
+                self.conflicts[entry.path_str].append(entry.stage)
+
+    def preload_workspace_oids(self) -> dict[Path, str]:
+        paths = []
+        for entry in self.repo.index.entries.values():
+            stat = self.stats.get(entry.path)
+            if stat is None or entry.stage != 0:
+                continue
+            if not entry.stat_match(stat) or entry.times_match(stat):
+                continue
+            size_match = self.inspector.size_match(entry, stat)
+            self.size_matches[entry.path] = size_match
+            if size_match:
+                paths.append(entry.path)
+
+        # Below this many files the hashing is cheaper than starting a pool,
+        # so they are left for the serial pass.
+        if len(paths) < Status.PARALLEL_HASH_MIN:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            return dict(zip(paths, pool.map(self.inspector.hash_workspace_file, paths)))
+
+    def check_index_against_workspace(
+        self, entry: Entry, oid: str | None = None
+    ) -> None:
         stat_result = self.stats.get(entry.path)
 
-        status = self.inspector.compare_index_to_workspace(entry, stat_result)
+        status = self.inspector.compare_index_to_workspace(
+            entry, stat_result, oid, self.size_matches.get(entry.path)
+        )
 
         if status is not None:
-            self.record_change(entry.path, self.workspace_changes, status)
+            self.record_change(entry.path_str, self.workspace_changes, status)
         else:
             assert stat_result is not None
             self.repo.index.update_entry_stat(entry, stat_result)
@@ -82,26 +157,39 @@ class Status:
         status = self.inspector.compare_tree_to_index(item, entry)
 
         if status is not None:
-            self.record_change(entry.path, self.index_changes, status)
+            self.record_change(entry.path_str, self.index_changes, status)
 
     def record_change(
-        self, path: Path, structure: MutableMapping[str, str], ty: str
+        self, path: str, structure: MutableMapping[str, str], ty: str
     ) -> None:
-        self.changed.add(str(path))
-        structure[str(path)] = ty
+        self.changed.add(path)
+        structure[path] = ty
 
     def scan_workspace(self, prefix: str = "") -> None:
-        for path, stat in self.repo.workspace.list_dir(prefix).items():
-            if self.repo.index.is_tracked(path):
-                if self.inspector._is_dir(stat):
-                    self.scan_workspace(str(path))
-                elif self.inspector._is_file(stat):
-                    self.stats[path] = stat
-            elif self.inspector._is_trackable_file(path, stat):
-                if self.inspector._is_dir(stat):
-                    self.untracked.add(f"{path}{os.sep}")
-                else:
-                    self.untracked.add(str(path))
+        pending: deque[str] = deque([prefix])
+
+        while pending:
+            for name, entry in self._walk(pending.pop()):
+                path = Path(name)
+                if self.repo.index.is_tracked(path):
+                    if entry.is_dir():
+                        pending.append(name)
+                    elif entry.is_file():
+                        self.stats[path] = entry.stat()
+                    continue
+
+                stat = entry.stat()
+                if self.inspector._is_trackable_file(path, stat):
+                    if self.inspector._is_dir(stat):
+                        self.untracked.add(f"{name}{os.sep}")
+                    else:
+                        self.untracked.add(name)
+
+    def _walk(self, prefix: str) -> Iterator[tuple[str, os.DirEntry[str]]]:
+        with os.scandir(self.repo.workspace.path / prefix) as it:
+            for entry in it:
+                if entry.name not in Workspace.IGNORE:
+                    yield os.path.join(prefix, entry.name), entry
 
     def detect_workspace_changes(self) -> None:
         for path, entry in self.repo.index.entries.items():
@@ -110,21 +198,23 @@ class Status:
     def check_index_entry(self, entry: Entry) -> None:
         stat = self.stats.get(entry.path, None)
         if stat is None:
-            self.record_change(entry.path, self.workspace_changes, "deleted")
+            self.record_change(entry.path_str, self.workspace_changes, "deleted")
             return
 
         if not entry.stat_match(stat):
-            self.record_change(entry.path, self.workspace_changes, "modified")
+            self.record_change(entry.path_str, self.workspace_changes, "modified")
             return
 
         if entry.times_match(stat):
             return
 
-        data = self.repo.workspace.read_file(entry.path)
-        blob = Blob(data)
-        oid = self.repo.database.hash_object(blob)
+        if not self.inspector.size_match(entry, stat):
+            self.record_change(entry.path_str, self.workspace_changes, "modified")
+            return
+
+        oid = self.inspector.hash_workspace_file(entry.path)
 
         if entry.oid == oid:
             self.repo.index.update_entry_stat(entry, stat)
         else:
-            self.record_change(entry.path, self.workspace_changes, "modified")
+            self.record_change(entry.path_str, self.workspace_changes, "modified")
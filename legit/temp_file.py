@@ -1,22 +1,24 @@
 from __future__ import annotations
 
+import base64
 import os
-import random
-import string
 from pathlib import Path
 from typing import BinaryIO
 
 
 class TempFile:
-    TEMP_CHARS: str = string.ascii_lowercase + string.ascii_uppercase + string.digits
+    BUFFER_SIZE: int = 128 * 1024
 
-    def __init__(self, dirname: Path, prefix: str) -> None:
+    def __init__(
+        self, dirname: Path, prefix: str, buffer_size: int = BUFFER_SIZE
+    ) -> None:
         self.dirname: Path = dirname
         self.path: Path = self.dirname / self.generate_temp_name(prefix)
+        self.buffer_size: int = buffer_size
         self.file: BinaryIO | None = None
 
     def generate_temp_name(self, prefix: str) -> str:
-        return prefix + "".join(random.choices(self.TEMP_CHARS, k=6))
+        return prefix + base64.b32encode(os.urandom(5))[:6].decode("ascii").lower()
 
     def write(self, data: bytes) -> None:
         if self.file is None:
@@ -26,6 +28,7 @@ class TempFile:
 
     def move(self, name: Path) -> None:
         assert self.file is not None
+        self.file.flush()
         self.file.close()
         os.rename(self.path, self.dirname / name)
 
@@ -34,7 +37,9 @@ class TempFile:
         mode = 0o644
 
         try:
-            self.file = os.fdopen(os.open(self.path, flags, mode), "rb+")
+            fd = os.open(self.path, flags, mode)
         except FileNotFoundError:
             self.dirname.mkdir(exist_ok=True, parents=True)
-            self.file = os.fdopen(os.open(self.path, flags, mode), "rb+")
+            fd = os.open(self.path, flags, mode)
+
+        self.file = os.fdopen(fd, "rb+", buffering=self.buffer_size)
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from pathlib import Path
-from typing import Callable, MutableMapping
+from typing import Callable, MutableMapping, TypeAlias
 
 from legit.db_entry import DatabaseEntry
 from legit.index import Entry
 
+SortedItems: TypeAlias = "list[tuple[bytes, DatabaseEntry | Entry | Tree]]"
+
 
 def git_sort_key(item: tuple[str, "DatabaseEntry | Entry | Tree"]) -> str:
     name, entry = item
@@ -15,13 +18,26 @@ def git_sort_key(item: tuple[str, "DatabaseEntry | Entry | Tree"]) -> str:
 
 
 class Tree:
+    TREE_MODE: int = 0o40000
+
     def __init__(
         self, entries: MutableMapping[str, "DatabaseEntry | Entry | Tree"] | None = None
     ) -> None:
         self.entries: MutableMapping[str, DatabaseEntry | Entry | Tree] = (
             entries if entries is not None else {}
         )
-        self.oid: str = ""
+        self._oid: str = ""
+        self.raw_oid: bytes = b""
+        self._sorted_items: SortedItems | None = None
+
+    @property
+    def oid(self) -> str:
+        return self._oid
+
+    @oid.setter
+    def oid(self, value: str) -> None:
+        self._oid = value
+        self.raw_oid = bytes.fromhex(value)
 
     @classmethod
     def parse(cls, payload: bytes) -> "Tree":
@@ -42,22 +58,28 @@ class Tree:
             oid = oid_bytes.hex()
             idx += 20
 
-            entries[name] = DatabaseEntry(oid=oid, mode=mode)
+            entries[name] = DatabaseEntry(oid=oid, mode=mode, raw_oid=oid_bytes)
 
         return cls(entries)
 
     @classmethod
     def from_entries(cls, entries: dict[tuple[Path, int], Entry]) -> "Tree":
-        entries = dict(sorted(entries.items(), key=lambda x: x[1].path))
+        return cls.from_sorted_entries(
+            entry for _, entry in sorted(entries.items(), key=lambda x: x[1].path)
+        )
 
+    @classmethod
+    def from_sorted_entries(cls, entries: Iterable[Entry]) -> Tree:
         root = Tree()
 
-        for _, entry in entries.items():
+        for entry in entries:
             root.add_entry(entry.parent_directories(), entry)
 
         return root
 
     def add_entry(self, parents: list[Path], entry: Entry) -> None:
+        self._sorted_items = None
+
         if not parents:
             self.entries[entry.basename()] = entry
         else:
@@ -69,26 +91,40 @@ class Tree:
     def type(self) -> str:
         return "tree"
 
+    def sorted_items(self) -> SortedItems:
+        if self._sorted_items is None:
+            self._sorted_items = [
+                (name.encode("utf-8"), entry)
+                for name, entry in sorted(self.entries.items(), key=git_sort_key)
+            ]
+        return self._sorted_items
+
     def to_bytes(self) -> bytes:
-        parts = []
-        for name, entry in sorted(self.entries.items(), key=git_sort_key):
+        data = bytearray()
+        self.write_to(data.extend)
+        return bytes(data)
+
+    def write_to(self, sink: Callable[[bytes], object]) -> None:
+        for name, entry in self.sorted_items():
             if isinstance(entry, Tree):
-                mode_str = "40000"
-                assert entry.oid is not None
-                oid = entry.oid
+                mode = Tree.TREE_MODE
+                assert entry.raw_oid
             else:
                 assert not isinstance(entry, DatabaseEntry)
-                m = entry.mode()
-                mode_str = oct(m)[2:]
-                oid = entry.oid
+                mode = entry.mode()
 
-            header = f"{mode_str} {name}".encode("utf-8") + b"\x00"
-            sha = bytes.fromhex(oid)
-            parts.append(header + sha)
-        return b"".join(parts)
+            sink(b"%o %s\x00" % (mode, name))
+            sink(entry.raw_oid)
 
     def traverse(self, code: Callable[["Tree"], None]) -> None:
-        for name, entry in self.entries.items():
-            if isinstance(entry, Tree):
-                entry.traverse(code)
-        code(self)
+        stack = [(self, iter(self.entries.values()))]
+
+        while stack:
+            tree, children = stack[-1]
+            for entry in children:
+                if isinstance(entry, Tree):
+                    stack.append((entry, iter(entry.entries.values())))
+                    break
+            else:
+                stack.pop()
+                code(tree)
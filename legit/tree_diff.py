@@ -27,14 +27,19 @@ class TreeDiff:
         a_tree = self.oid_to_tree(a)
         b_tree = self.oid_to_tree(b)
 
-        a_entries = cast(
-            dict[Path, DatabaseEntry],
-            ({Path(k): v for k, v in a_tree.entries.items()} if a_tree else {}),
-        )
-        b_entries = cast(
-            dict[Path, DatabaseEntry],
-            ({Path(k): v for k, v in b_tree.entries.items()} if b_tree else {}),
-        )
+        a_items = cast(dict[str, DatabaseEntry], a_tree.entries if a_tree else {})
+        b_items = cast(dict[str, DatabaseEntry], b_tree.entries if b_tree else {})
+
+        a_entries = {
+            Path(name): entry
+            for name, entry in a_items.items()
+            if entry != b_items.get(name)
+        }
+        b_entries = {
+            Path(name): entry
+            for name, entry in b_items.items()
+            if entry != a_items.get(name)
+        }
 
         self.detect_deletions(a_entries, b_entries, pathfilter)
         self.detect_additions(a_entries, b_entries, pathfilter)
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import errno
 import os
 import shutil
 import stat
 from collections.abc import Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING, MutableMapping, Optional
 
@@ -18,66 +20,94 @@ class Workspace:
     class NoPermission(Exception):
         pass
 
-    IGNORE: list[str] = [
-        ".",
-        "..",
-        ".git",
-        "__pycache__",
-        "env",
-        ".pytest_cache",
-        ".mypy_cache",
-        ".ruff_cache",
-        "legit.egg-info",
-        "build",
-    ]
+    IGNORE: frozenset[str] = frozenset(
+        {
+            ".",
+            "..",
+            ".git",
+            "__pycache__",
+            "env",
+            ".pytest_cache",
+            ".mypy_cache",
+            ".ruff_cache",
+            "legit.egg-info",
+            "build",
+        }
+    )
+
+    WRITE_BATCH_SIZE: int = 64
 
     def __init__(self, path: Path) -> None:
         self.path: Path = path
+        self.path_str: str = str(path)
+        self.stat_cache: dict[Path, os.stat_result | None] | None = None
 
     def write_file(
         self, path: Path, data: bytes, mode: Optional[int] = None, mkdir: bool = False
     ) -> None:
-        full_path: Path = self.path / path
+        full_path = self._join(path)
         if mkdir:
-            full_path.parent.mkdir(exist_ok=True, parents=True)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
 
         flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
         with os.fdopen(os.open(full_path, flags), "wb") as f:
             f.write(data)
 
         if mode:
-            full_path.chmod(mode)
+            os.chmod(full_path, mode)
+
+        self.invalidate(path)
 
     def apply_migration(self, migration: "Migration") -> None:
-        self.apply_change_list(migration, "delete")
+        # The pool only starts threads once a batch is submitted to it.
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            self._apply_migration(migration, pool)
+
+    def _apply_migration(self, migration: Migration, pool: Executor) -> None:
+        self.apply_change_list(migration, "delete", pool)
 
         for d in sorted(migration.rmdirs, key=lambda p: p.parts, reverse=True):
             self.remove_directory(d)
 
-        for d in sorted(migration.mkdirs, key=lambda p: (len(p.parts), p)):
+        # Creating only the deepest directories builds every ancestor on the
+        # way, so shared prefixes are not made one level at a time.
+        ancestors = {parent for d in migration.mkdirs for parent in d.parents}
+        for d in sorted(migration.mkdirs - ancestors - {Path(".")}):
             self.make_directory(d)
 
-        self.apply_change_list(migration, "update")
-        self.apply_change_list(migration, "create")
+        self.apply_change_list(migration, "update", pool)
+        self.apply_change_list(migration, "create", pool)
 
     def remove(self, path: Path) -> None:
-        try:
-            self._rm_rf(self.path / path)
-            for parent in Path(path).parents:
-                self.remove_directory(parent)
-        except FileNotFoundError:
-            pass
+        self._rm_rf(self.path / path)
+
+        for parent in Path(path).parents:
+            if parent == Path("."):
+                break
+            try:
+                os.rmdir(self._join(parent))
+            except OSError as e:
+                if e.errno in (errno.ENOTEMPTY, errno.EEXIST):
+                    break
+                continue
+            self.invalidate(parent)
 
     def _rm_rf(self, path: Path) -> None:
         try:
             if path.is_dir():
                 shutil.rmtree(path)
+                self.clear_stat_cache()
             else:
                 path.unlink()
+                self.invalidate(path.relative_to(self.path))
         except (FileNotFoundError, NotADirectoryError):
             pass
 
-    def apply_change_list(self, migration: "Migration", action: str) -> None:
+    def apply_change_list(
+        self, migration: "Migration", action: str, pool: Executor
+    ) -> None:
+        pending: list[tuple[Path, bytes, int]] = []
+
         for filename, entry in migration.changes[action]:
             path = self.path / filename
 
@@ -86,40 +116,61 @@ class Workspace:
             if action == "delete":
                 continue
 
-            p = path.parent
-
-            while p != self.path and p.exists() and p.is_file():
-                p.unlink()
-                p = p.parent
-
-            path.parent.mkdir(parents=True, exist_ok=True)
-
-            flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
-
             assert entry is not None
 
             if entry.is_tree():
                 self.make_directory(filename)
             else:
-                data = migration.blob_data(entry.oid)
-                with os.fdopen(os.open(path, flags, 0o644), "wb+") as f:
-                    f.write(data)
-                path.chmod(entry.mode)
+                pending.append((filename, migration.blob_data(entry.oid), entry.mode))
+                if len(pending) >= Workspace.WRITE_BATCH_SIZE:
+                    self.write_blobs(pending, pool)
+                    pending = []
+
+        self.write_blobs(pending, pool)
+
+    def write_blobs(self, blobs: list[tuple[Path, bytes, int]], pool: Executor) -> None:
+        if len(blobs) < 2:
+            for blob in blobs:
+                self._write_blob(*blob)
+        else:
+            list(pool.map(lambda blob: self._write_blob(*blob), blobs))
+
+        for filename, _, _ in blobs:
+            self.invalidate(filename)
+
+    def _write_blob(self, filename: Path, data: bytes, mode: int) -> None:
+        path = self._join(filename)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+
+        fd = os.open(path, flags, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
+        os.chmod(path, mode)
 
     def remove_directory(self, dirname: Path) -> None:
         try:
-            os.rmdir(self.path / dirname)
+            os.rmdir(self._join(dirname))
+            self.invalidate(dirname)
         except OSError:
             pass
 
     def make_directory(self, dirname: Path) -> None:
-        path = self.path / dirname
-        stat_result = self.stat_file(dirname)
+        path = self._join(dirname)
 
-        if self._is_file(stat_result):
-            path.unlink()
+        try:
+            os.mkdir(path)
+        except FileExistsError:
+            if self._is_file(self.stat_file(dirname)):
+                os.unlink(path)
+                os.mkdir(path)
+        except FileNotFoundError:
+            os.makedirs(path, exist_ok=True)
 
-        path.mkdir(exist_ok=True, parents=True)
+        self.invalidate(dirname)
 
     def _is_file(self, stat_result: os.stat_result | None) -> bool:
         if stat_result is None:
@@ -127,44 +178,79 @@ class Workspace:
         return stat.S_ISREG(stat_result.st_mode)
 
     def list_files(self, path: Path) -> Iterator[Path]:
-        if path.is_dir():
-            for f in path.iterdir():
-                if f.name not in Workspace.IGNORE:
-                    yield from self.list_files(f)
-        elif path.exists():
+        if not path.is_dir():
+            if not path.exists():
+                raise Workspace.MissingFile(
+                    f"pathspec '{path.relative_to(self.path)}' did not match any files"
+                )
             yield path.relative_to(self.path)
-        else:
-            raise Workspace.MissingFile(
-                f"pathspec '{path.relative_to(self.path)}' did not match any files"
-            )
+            return
 
-    def list_dir(self, dirname: str) -> MutableMapping[Path, os.stat_result]:
-        stats = {}
+        base = self.path_str
+        stack = [str(path)]
 
-        path = self.path / dirname
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.name in Workspace.IGNORE:
+                        continue
+                    if entry.is_dir():
+                        stack.append(entry.path)
+                    else:
+                        yield Path(os.path.relpath(entry.path, base))
 
-        entries = []
-        for f in path.iterdir():
-            if f.name not in Workspace.IGNORE:
-                entries.append(f)
+    def list_dir(self, dirname: str) -> MutableMapping[Path, os.stat_result]:
+        stats = {}
 
-        for entry in entries:
-            relative = (path / entry).relative_to(self.path)
-            stats[relative] = (path / entry).stat()
+        with os.scandir(self._join(dirname)) as it:
+            for entry in it:
+                if entry.name in Workspace.IGNORE:
+                    continue
+                relative = os.path.relpath(entry.path, self.path_str)
+                stats[Path(relative)] = entry.stat()
 
         return stats
 
     def read_file(self, path: Path) -> bytes:
         try:
-            with open(self.path / path, "rb") as f:
+            with open(self._join(path), "rb") as f:
                 return f.read()
         except PermissionError:
             raise Workspace.NoPermission(f"open('{path.name}'): Permission denied")
 
     def stat_file(self, path: Path) -> Optional[os.stat_result]:
+        if self.stat_cache is not None and path in self.stat_cache:
+            return self.stat_cache[path]
+
         try:
-            return (self.path / path).stat()
+            stat_result: os.stat_result | None = os.stat(self._join(path))
         except FileNotFoundError:
-            return None
+            stat_result = None
         except PermissionError:
             raise Workspace.NoPermission(f"stat('{path.name}'): Permission denied")
+
+        if self.stat_cache is not None:
+            self.stat_cache[path] = stat_result
+        return stat_result
+
+    def _join(self, path: Path | str) -> str:
+        return os.path.join(self.path_str, path)
+
+    def enable_stat_cache(self) -> None:
+        # Results are only remembered while a migration runs; at any other
+        # time the workspace may be changed behind our back.
+        self.stat_cache = {}
+
+    def disable_stat_cache(self) -> None:
+        self.stat_cache = None
+
+    def invalidate(self, path: Path) -> None:
+        if self.stat_cache is None:
+            return
+        self.stat_cache.pop(path, None)
+        for parent in path.parents:
+            self.stat_cache.pop(parent, None)
+
+    def clear_stat_cache(self) -> None:
+        if self.stat_cache is not None:
+            self.stat_cache.clear()
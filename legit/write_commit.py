@@ -3,7 +3,7 @@ from __future__ import annotations
 import textwrap
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, MutableMapping, Optional, TextIO, cast
+from typing import TYPE_CHECKING, Final, MutableMapping, Optional, TextIO, cast
 
 from legit.author import Author
 from legit.commit import Commit as CommitObject
@@ -14,13 +14,13 @@ if TYPE_CHECKING:
     from legit.repository import Repository
 
 
-CONFLICT_MESSAGE: str = textwrap.dedent("""\
+CONFLICT_MESSAGE: Final = textwrap.dedent("""\
     hint: Fix them up in the work tree, and then use 'legit add/rm <file>'
     hint: as appropriate to mark resolution and make a commit.
     fatal: Exiting because of an unresolved conflict.
 """)
 
-MERGE_NOTES: str = textwrap.dedent(
+MERGE_NOTES: Final = textwrap.dedent(
     """
     It looks like you may be committing a merge.
     If this is not correct, please remove the file
@@ -29,14 +29,14 @@ MERGE_NOTES: str = textwrap.dedent(
     """
 )
 
-COMMIT_NOTES = textwrap.dedent(
+COMMIT_NOTES: Final = textwrap.dedent(
     """\
     Please enter the commit message for your changes. Lines starting
     with '#' will be ignored, and an empty message aborts the commit.
     """
 )
 
-CHERRY_PICK_NOTES = textwrap.dedent(
+CHERRY_PICK_NOTES: Final = textwrap.dedent(
     """
     It looks like you may be committing a cherry-pick.
     If this is not correct, please remove the file
@@ -91,28 +91,31 @@ class WriteCommitMixin:
 
         args_iter = iter(self.args)
         for arg in args_iter:
-            if arg in ("-e", "--edit"):
-                self.edit = True
-            elif arg == "--no-edit":
-                self.edit = False
-
-            elif arg.startswith("--message="):
-                self.message = arg.split("=", 1)[1]
-            elif arg == "-m":
-                try:
-                    self.message = next(args_iter)
-                except StopIteration:
+            match arg:
+                case "-e" | "--edit":
+                    self.edit = True
+                case "--no-edit":
+                    self.edit = False
+
+                case "-m":
+                    try:
+                        self.message = next(args_iter)
+                    except StopIteration:
+                        pass
+                case "-F":
+                    try:
+                        file_path = next(args_iter)
+                        self.file = self.expanded_path(file_path)
+                    except StopIteration:
+                        pass
+
+                case _ if arg[:2] != "--":
                     pass
-
-            elif arg.startswith("--file="):
-                file_path = arg.split("=", 1)[1]
-                self.file = self.expanded_path(file_path)
-            elif arg == "-F":
-                try:
-                    file_path = next(args_iter)
+                case _ if arg.startswith("--message="):
+                    self.message = arg.split("=", 1)[1]
+                case _ if arg.startswith("--file="):
+                    file_path = arg.split("=", 1)[1]
                     self.file = self.expanded_path(file_path)
-                except StopIteration:
-                    pass
 
     def print_commit(self, commit: CommitObject) -> None:
         ref = self.repo.refs.current_ref()
@@ -139,8 +142,10 @@ class WriteCommitMixin:
         return commit
 
     def write_tree(self) -> Tree:
-        root = Tree.from_entries(self.repo.index.entries)
-        root.traverse(lambda tree: self.repo.database.store(tree))
+        root = Tree.from_sorted_entries(self.repo.index.sorted_entries())
+        trees: list[Tree] = []
+        root.traverse(trees.append)
+        self.repo.database.store_many(trees)
         return root
 
     def resume_merge(self, ty: str) -> None:
@@ -1,42 +1,84 @@
 from __future__ import annotations
 
+import os
 import tempfile
 from contextlib import contextmanager
-from io import TextIOBase
+from datetime import datetime
+from io import StringIO, TextIOBase
 from pathlib import Path
-from typing import Generator, TextIO, cast
+from typing import ClassVar, Generator, TextIO, cast
 
+from legit.author import Author
 from legit.blob import Blob
 from legit.cmd_base import Base
+from legit.commit import Commit
+from legit.db_entry import DatabaseEntry
+from legit.index import Entry
 from legit.repository import Repository
+from legit.tree import Tree
 
 
 @contextmanager
 def captured_stderr() -> Generator[CapturedStderr]:
-    cs = CapturedStderr()
+    cs = CapturedStderr.acquire()
     try:
         yield cs
     finally:
-        cs.close()
+        cs.release()
 
 
 class CapturedStderr(TextIOBase):
-    def __init__(self) -> None:
-        self._file: TextIO = tempfile.TemporaryFile(mode="w+")
+    POOL: ClassVar[list[CapturedStderr]] = []
+
+    def __init__(self, use_fd: bool = False) -> None:
+        self._file: TextIO = self._spool() if use_fd else StringIO()
+
+    @staticmethod
+    def _spool() -> TextIO:
+        # The buffer owns the file and closes it in release() or close().
+        return tempfile.TemporaryFile(mode="w+")
+
+    @classmethod
+    def acquire(cls) -> CapturedStderr:
+        try:
+            return cls.POOL.pop()
+        except IndexError:
+            return cls()
+
+    @property
+    def has_fd(self) -> bool:
+        return not isinstance(self._file, StringIO)
+
+    def release(self) -> None:
+        # Only in-memory buffers are reused; one promoted to a file would make
+        # every later command that picks it up flush on each write.
+        if self.has_fd:
+            self._file.close()
+            return
+        self._file.seek(0)
+        self._file.truncate()
+        CapturedStderr.POOL.append(self)
 
     def fileno(self) -> int:
+        # Only a spawned remote agent needs a real descriptor, so the in-memory
+        # buffer moves to a temporary file the first time one is asked for.
+        if isinstance(self._file, StringIO):
+            data = self._file.getvalue()
+            self._file = self._spool()
+            self._file.write(data)
+            self._file.flush()
         return self._file.fileno()
 
     def write(self, s: str) -> int:
         n = self._file.write(s)
-        self._file.flush()
+        if not isinstance(self._file, StringIO):
+            self._file.flush()
         return n
 
     def flush(self) -> None:
         return self._file.flush()
 
     def read(self, n: int | None = -1) -> str:
-        self._file.flush()
         self._file.seek(0)
         if n is not None:
             return self._file.read(n)
@@ -59,24 +101,32 @@ def assert_status(cmd: Base, expected: int) -> None:
     assert cmd.status == expected, f"Expected status {expected}, got {cmd.status}"
 
 
+def _read_all(stream: CapturedStderr | TextIO) -> str:
+    # In-memory buffers hand back their contents without a seek and read.
+    if isinstance(stream, StringIO):
+        return stream.getvalue()
+    stream.seek(0)
+    return stream.read()
+
+
 def assert_stdout(stdout: TextIO, expected: str) -> None:
-    stdout.seek(0)
-    data = stdout.read()
+    data = _read_all(stdout)
     assert data == expected, f"Expected stdout {expected!r}, got {data!r}"
 
 
 def assert_stderr(stderr: CapturedStderr | TextIO, expected: str) -> None:
-    stderr.seek(0)
-    data = stderr.read()
+    data = _read_all(stderr)
     assert data == expected, f"Expected stderr {expected!r}, got {data!r}"
 
 
 def _snapshot_workspace(repo_path: Path) -> dict[str, str]:
     result: dict[str, str] = {}
-    for path in repo_path.rglob("*"):
-        if ".git" in path.parts or not path.is_file():
-            continue
-        result[str(path.relative_to(repo_path))] = path.read_text()
+    for dirpath, dirnames, filenames in os.walk(repo_path):
+        dirnames[:] = [d for d in dirnames if d != ".git"]
+        for name in filenames:
+            full = os.path.join(dirpath, name)
+            if os.path.isfile(full):
+                result[os.path.relpath(full, repo_path)] = Path(full).read_text()
     return result
 
 
@@ -99,3 +149,25 @@ def assert_index(repo: Repository, expected: dict[str, str]) -> None:
         )
 
     assert files == expected
+
+
+# Stores a linear history where each commit sets file.txt to its message and
+# points HEAD at the last one, without going through the workspace or index.
+def store_commits(repo: Repository, messages: list[str]) -> list[Commit]:
+    author = Author("A. U. Thor", "author@example.com", datetime.now().astimezone())
+    parents: list[str] = []
+    commits: list[Commit] = []
+
+    for msg in messages:
+        blob = Blob(msg.encode("utf-8"))
+        repo.database.store(blob)
+        entry = DatabaseEntry(blob.oid, 0o100644)
+        tree = Tree({"file.txt": Entry.create_from_db(Path("file.txt"), entry, 0)})
+        repo.database.store(tree)
+        commit = Commit(parents, tree.oid, author, author, f"{msg}\n")
+        repo.database.store(commit)
+        commits.append(commit)
+        parents = [commit.oid]
+
+    repo.refs.update_head(parents[0])
+    return commits
@@ -1,5 +1,8 @@
+import os
 import shutil
+import tempfile
 from datetime import datetime
+from functools import partial
 from io import StringIO
 from pathlib import Path
 from typing import (
@@ -15,6 +18,7 @@ from typing import (
 
 import pytest
 from freezegun import freeze_time
+from freezegun.api import real_datetime
 
 from legit.blob import Blob
 from legit.cmd_base import Base
@@ -32,6 +36,7 @@ LegitCmdResult: TypeAlias = tuple[Base, StringIO, StringIO, CapturedStderr]
 ResolveRevision: TypeAlias = Callable[[str], str]
 LoadCommit: TypeAlias = Callable[[str], Blob | CommitObj | Tree | Record]
 WriteFile: TypeAlias = Callable[[str, str], None]
+WriteFiles: TypeAlias = Callable[[Mapping[str, str]], None]
 Mkdir: TypeAlias = Callable[[str], None]
 Touch: TypeAlias = Callable[[str], None]
 Delete: TypeAlias = Callable[[str], None]
@@ -50,12 +55,62 @@ class LegitCmd(Protocol):
     ) -> "LegitCmdResult": ...
 
 
+class SnapshotCmd(Protocol):
+    def __call__(self, *argv: str, env: Mapping[str, str] | None = None) -> Base: ...
+
+
+BuildRepo: TypeAlias = Callable[[Path, SnapshotCmd], None]
+RepoSnapshot: TypeAlias = Callable[[BuildRepo], Path]
+
+
 class Commit(Protocol):
     def __call__(
         self, message: str, when: Optional[datetime] = ..., author: bool = ...
     ) -> LegitCmdResult: ...
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--cleanup-tmp",
+        action="store_true",
+        help="remove each test repository as soon as the test finishes",
+    )
+    parser.addini(
+        "legit_tmpfs",
+        type="bool",
+        default=False,
+        help="keep test repositories under /dev/shm instead of pytest's basetemp",
+    )
+
+
+SHM_DIR = Path("/dev/shm")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "no_repo: the test does not need an initialized repository"
+    )
+    config.addinivalue_line(
+        "markers", "snapshot(build): start the test from a repository built once"
+    )
+    config.addinivalue_line(
+        "markers", "wall_clock: commits use the real clock and ignore their date"
+    )
+
+    # Opt-in only: the tmpfs directory bypasses pytest's tmp_path retention and
+    # is left behind in memory if the run dies before cleanup.
+    if (
+        config.getini("legit_tmpfs")
+        and config.option.basetemp is None
+        and os.access(SHM_DIR, os.W_OK)
+    ):
+        config.option.basetemp = tempfile.mkdtemp(prefix="legit-", dir=SHM_DIR)
+        config.add_cleanup(
+            partial(shutil.rmtree, config.option.basetemp, ignore_errors=True)
+        )
+
+
 @pytest.fixture
 def load_commit(repo: Repository, resolve_revision: ResolveRevision) -> LoadCommit:
     def _load_commit(expression: str) -> Blob | CommitObj | Tree | Record:
@@ -77,13 +132,77 @@ def repo_path(tmp_path: Path) -> Path:
     return tmp_path / "test_repo"
 
 
+@pytest.fixture(scope="session")
+def template_repo_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    path = tmp_path_factory.mktemp("template") / "test_repo"
+    Command.execute(path, {}, ["legit", "init"], StringIO(), StringIO(), StringIO())
+    return path
+
+
+@pytest.fixture(scope="session")
+def repo_snapshot(
+    tmp_path_factory: pytest.TempPathFactory, template_repo_path: Path
+) -> RepoSnapshot:
+    snapshots: dict[BuildRepo, Path] = {}
+
+    def _repo_snapshot(build: BuildRepo) -> Path:
+        if build in snapshots:
+            return snapshots[build]
+
+        path = tmp_path_factory.mktemp("snapshot") / "test_repo"
+        copy_repo(template_repo_path, path)
+
+        def snapshot_cmd(*argv: str, env: Mapping[str, str] | None = None) -> Base:
+            return Command.execute(
+                path,
+                dict(env or {}),
+                ["legit", *argv],
+                StringIO(),
+                StringIO(),
+                StringIO(),
+            )
+
+        build(path, snapshot_cmd)
+        snapshots[build] = path
+        return path
+
+    return _repo_snapshot
+
+
+def copy_repo(source: Path, dest: Path) -> None:
+    # Objects are written once under their final name and never edited, so the
+    # copy can share them by hard link; everything else may be rewritten.
+    objects = source / ".git" / "objects"
+
+    def ignore_objects(path: str, names: list[str]) -> list[str]:
+        return ["objects"] if Path(path) == objects.parent else []
+
+    shutil.copytree(source, dest, ignore=ignore_objects)
+    shutil.copytree(objects, dest / ".git" / "objects", copy_function=os.link)
+
+
 @pytest.fixture(autouse=True)
-def setup_and_teardown(repo_path: Path) -> Generator[None]:
-    Command.execute(
-        repo_path, {}, ["legit", "init"], StringIO(), StringIO(), StringIO()
-    )
+def setup_and_teardown(
+    request: pytest.FixtureRequest, repo_path: Path, template_repo_path: Path
+) -> Generator[None]:
+    if request.node.get_closest_marker("no_repo"):
+        yield
+        return
+
+    # Tests marked with a snapshot start from a repository that is built once
+    # per session and copied, rather than replaying the same setup commands.
+    marker = request.node.get_closest_marker("snapshot")
+    if marker is None:
+        source = template_repo_path
+    else:
+        source = request.getfixturevalue("repo_snapshot")(marker.args[0])
+
+    copy_repo(source, repo_path)
     yield
-    shutil.rmtree(repo_path, ignore_errors=True)
+
+    # pytest already prunes old tmp_path trees, so removal is opt-in.
+    if request.config.getoption("cleanup_tmp"):
+        shutil.rmtree(repo_path, ignore_errors=True)
 
 
 @pytest.fixture
@@ -97,7 +216,10 @@ def repo(repo_path: Path) -> Generator[Repository]:
 
 
 @pytest.fixture
-def commit(legit_cmd: LegitCmd) -> Commit:
+def commit(legit_cmd: LegitCmd, request: pytest.FixtureRequest) -> Commit:
+    freezer = freeze_time(real_datetime.now().astimezone())
+    wall_clock = request.node.get_closest_marker("wall_clock") is not None
+
     def _commit(
         message: str, when: Optional[datetime] = None, author: bool = True
     ) -> LegitCmdResult:
@@ -109,11 +231,17 @@ def commit(legit_cmd: LegitCmd) -> Commit:
         else:
             env = {}
 
-        if when is None:
-            when = datetime.now().astimezone()
+        if when is None or wall_clock:
+            return legit_cmd("commit", "-m", message, env=env)
 
-        with freeze_time(when):
+        # Time is frozen only for the commit itself, so the racy checks in
+        # later commands and assertions see the real clock.
+        clock = freezer.start()
+        try:
+            clock.move_to(when)
             return legit_cmd("commit", "-m", message, env=env)
+        finally:
+            freezer.stop()
 
     return _commit
 
@@ -123,12 +251,23 @@ def write_file(repo_path: Path) -> WriteFile:
     def _write_file(name: str, contents: str) -> None:
         path = repo_path / name
         path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w") as f:
-            f.write(contents)
+        path.write_text(contents)
 
     return _write_file
 
 
+@pytest.fixture
+def write_files(repo_path: Path) -> WriteFiles:
+    def _write_files(files: Mapping[str, str]) -> None:
+        paths = {name: repo_path / name for name in files}
+        for parent in {path.parent for path in paths.values()}:
+            parent.mkdir(parents=True, exist_ok=True)
+        for name, path in paths.items():
+            path.write_text(files[name])
+
+    return _write_files
+
+
 @pytest.fixture
 def mkdir(repo_path: Path) -> Mkdir:
     def _mkdir(name: str) -> None:
@@ -178,8 +317,13 @@ def make_unreadable(repo_path: Path) -> MakeUnreadable:
 
 
 @pytest.fixture
-def legit_cmd(repo_path: Path) -> Generator[LegitCmd]:
-    to_close = []
+def cmd_repo() -> Repository | None:
+    return None
+
+
+@pytest.fixture
+def legit_cmd(repo_path: Path, cmd_repo: Repository | None) -> Generator[LegitCmd]:
+    captured: set[CapturedStderr] = set()
 
     def _legit_cmd(
         *argv: str,
@@ -189,8 +333,8 @@ def legit_cmd(repo_path: Path) -> Generator[LegitCmd]:
         env = env or {}
         stdin = StringIO(stdin_data)
         stdout = StringIO()
-        stderr = CapturedStderr()
-        to_close.append(stderr)
+        stderr = CapturedStderr.acquire()
+        captured.add(stderr)
         cmd = Command.execute(
             repo_path,
             cast(dict[str, str], env),
@@ -198,13 +342,14 @@ def legit_cmd(repo_path: Path) -> Generator[LegitCmd]:
             stdin,
             stdout,
             cast(TextIO, stderr),
+            cmd_repo,
         )
         return cmd, stdin, stdout, stderr
 
     yield _legit_cmd
 
-    for s in to_close:
-        s.close()
+    for s in captured:
+        s.release()
 
 
 @pytest.fixture
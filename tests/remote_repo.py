@@ -2,10 +2,10 @@ from io import StringIO
 from pathlib import Path
 from typing import Any, TextIO, cast
 
-from legit.cmd_base import Base
 from legit.command import Command
 from legit.repository import Repository
 from tests.cmd_helpers import CapturedStderr
+from tests.conftest import LegitCmdResult
 
 
 class RemoteRepo:
@@ -45,7 +45,7 @@ class RemoteRepo:
         *argv: Any,
         env: dict[str, str] | None = None,
         stdin_data: str = "",
-    ) -> tuple[Base, StringIO, StringIO, CapturedStderr]:
+    ) -> LegitCmdResult:
         env = env or {}
         stdin = StringIO(stdin_data)
         stdout = StringIO()
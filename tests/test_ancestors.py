@@ -1,4 +1,5 @@
 import datetime
+from collections.abc import Generator, MutableMapping
 from pathlib import Path
 from typing import Callable, TypeAlias, cast
 
@@ -6,50 +7,95 @@ import pytest
 
 from legit.author import Author
 from legit.bases import Bases
+from legit.blob import Blob
 from legit.commit import Commit
 from legit.common_ancestors import CommonAncestors
 from legit.database import Database
+from legit.pack import Record
+from legit.tree import Tree
 
 Ancestor: TypeAlias = Callable[[str, str], str | list[str]]
 MergeBase: TypeAlias = Callable[[str, str], str | list[str]]
 
+pytestmark = pytest.mark.no_repo
+
+AUTHOR = Author(
+    "A. U. Thor",
+    "author@example.com",
+    datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC),
+)
+
+
+class InMemoryDatabase(Database):
+    def __init__(self) -> None:
+        self.path: Path = Path()
+        self.objects: MutableMapping[str, Blob | Commit | Tree] = {}
+
+    def close(self) -> None:
+        pass
+
+    def store(self, obj: Blob | Commit | Tree | Record) -> None:
+        obj.oid = self.hash_object(obj)
+        self.objects[obj.oid] = cast(Blob | Commit | Tree, obj)
+
+    def load(self, oid: str) -> Blob | Commit | Tree | Record:
+        return self.objects[oid]
+
 
 class GraphBuilder:
+    __slots__ = ("commits", "db", "messages")
+
     def __init__(self, db: Database) -> None:
         self.db: Database = db
         self.commits: dict[str, str] = {}
+        self.messages: dict[str, str] = {}
 
     def commit(self, parents: list[str], message: str) -> None:
-        parent_oids: list[str] = [self.commits[p] for p in parents]
-        author: Author = Author(
-            "A. U. Thor", "author@example.com", datetime.datetime.now().astimezone()
-        )
-        commit: Commit = Commit(parent_oids, "0" * 40, author, author, message)
-        self.db.store(commit)
-        self.commits[message] = commit.oid
+        self.store([self.commits[p] for p in parents], message)
 
     def chain(self, names: list[str | None]) -> None:
-        for parent, msg in zip(names, names[1:]):
-            parents = [] if parent is None else [parent]
+        # Each link's parent is the commit just stored, so carry its oid along
+        # rather than looking it up again by name.
+        first = names[0]
+        prev = None if first is None else self.commits[first]
+
+        for msg in names[1:]:
             assert msg is not None
-            self.commit(parents, msg)
+            prev = self.store([] if prev is None else [prev], msg)
 
+    def store(self, parent_oids: list[str], message: str) -> str:
+        commit: Commit = Commit(parent_oids, "0" * 40, AUTHOR, AUTHOR, message)
+        self.db.store(commit)
+        self.commits[message] = commit.oid
+        self.messages[commit.oid] = message
+        return commit.oid
 
-@pytest.fixture
-def db(repo_path: Path) -> Database:
-    return Database(repo_path / "objects")
 
+@pytest.fixture(scope="session")
+def db() -> Database:
+    # Commits hash the same in every scenario, so graphs that share a prefix
+    # share its objects; each class only keeps its own names in its builder.
+    return InMemoryDatabase()
 
-@pytest.fixture
+
+@pytest.fixture(scope="class")
 def builder(db: Database) -> GraphBuilder:
     return GraphBuilder(db)
 
 
+@pytest.fixture(autouse=True)
+def shared_graph(builder: GraphBuilder) -> Generator[None]:
+    # The graph is built once per class, so no test may add to it.
+    commits = dict(builder.commits)
+    yield
+    assert builder.commits == commits
+
+
 @pytest.fixture
 def ancestor(builder: GraphBuilder, db: Database) -> Ancestor:
     def _ancestor(left: str, right: str) -> str | list[str]:
         common = CommonAncestors(db, builder.commits[left], [builder.commits[right]])
-        msgs = [cast(Commit, db.load(oid)).message for oid in common.find()]
+        msgs = [builder.messages[oid] for oid in common.find()]
         return msgs[0] if len(msgs) == 1 else sorted(msgs)
 
     return _ancestor
@@ -59,7 +105,7 @@ def ancestor(builder: GraphBuilder, db: Database) -> Ancestor:
 def merge_base(builder: GraphBuilder, db: Database) -> MergeBase:
     def _merge_base(left: str, right: str) -> str | list[str]:
         bases = Bases(db, builder.commits[left], builder.commits[right])
-        msgs = [cast(Commit, db.load(oid)).message for oid in bases.find()]
+        msgs = [builder.messages[oid] for oid in bases.find()]
         return msgs[0] if len(msgs) == 1 else sorted(msgs)
 
     return _merge_base
@@ -69,8 +115,9 @@ class TestLinearHistory:
     #   o---o---o---o
     #   A   B   C   D
 
-    @pytest.fixture(autouse=True)
-    def setup_chain(self, builder: GraphBuilder) -> None:
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def setup_chain(cls, builder: GraphBuilder) -> None:
         builder.chain([None, "A", "B", "C", "D"])
 
     def test_it_finds_the_common_ancestor_of_a_commit_with_itself(
@@ -108,8 +155,9 @@ class TestForkingHistory:
     #              o---o---o
     #              L   M   N
 
-    @pytest.fixture(autouse=True)
-    def setup_chain(self, builder: GraphBuilder) -> None:
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def setup_chain(cls, builder: GraphBuilder) -> None:
         b = builder
         b.chain([None, "A", "B", "C", "D"])
         b.chain(["B", "E", "F", "G", "H"])
@@ -145,8 +193,9 @@ class TestWithMerge:
     #         o---o---o
     #         D   E   F
 
-    @pytest.fixture(autouse=True)
-    def setup_chain(self, builder: GraphBuilder) -> None:
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def setup_chain(cls, builder: GraphBuilder) -> None:
         b = builder
         b.chain([None, "A", "B", "C"])
         b.chain(["B", "D", "E", "F"])
@@ -170,8 +219,9 @@ class TestMergeFurtherFromOneParent:
     #         o---o---o
     #         D   E   F
 
-    @pytest.fixture(autouse=True)
-    def setup_chain(self, builder: GraphBuilder) -> None:
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def setup_chain(cls, builder: GraphBuilder) -> None:
         b = builder
         b.chain([None, "A", "B", "C"])
         b.chain(["B", "D", "E", "F"])
@@ -193,8 +243,9 @@ class TestCommitsBetweenAncestorAndMerge:
     #         D  E \
     #               o F
 
-    @pytest.fixture(autouse=True)
-    def setup_chain(self, builder: GraphBuilder) -> None:
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def setup_chain(cls, builder: GraphBuilder) -> None:
         b = builder
         b.chain([None, "A", "B", "C"])
         b.chain(["B", "D", "E", "F"])
@@ -220,8 +271,9 @@ class TestStaleResultsHistory:
     #             o-----o
     #             P     Q
 
-    @pytest.fixture(autouse=True)
-    def setup_chain(self, builder: GraphBuilder) -> None:
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def setup_chain(cls, builder: GraphBuilder) -> None:
         b = builder
         b.chain([None, "A", "B", "C"])
         b.chain(["B", "D", "E", "F"])
@@ -245,8 +297,9 @@ class TestManyCommonAncestors:
     #              o---o---o---o---o---o
     #              U   V   W   X   Y   Z
 
-    @pytest.fixture(autouse=True)
-    def setup_chain(self, builder: GraphBuilder) -> None:
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def setup_chain(cls, builder: GraphBuilder) -> None:
         b = builder
         pads1 = [f"pad-1-{i}" for i in range(1, 5)]
         pads2 = [f"pad-2-{i}" for i in range(1, 5)]
@@ -1,3 +1,5 @@
+import pytest
+
 from legit.repository import Repository
 from tests.cmd_helpers import assert_stderr, assert_stdout
 from tests.conftest import (
@@ -5,9 +7,15 @@ from tests.conftest import (
     MakeExecutable,
     MakeUnreadable,
     WriteFile,
+    WriteFiles,
 )
 
 
+@pytest.fixture
+def cmd_repo(repo: Repository) -> Repository:
+    return repo
+
+
 def get_index(repo: Repository) -> list[tuple[int, str]]:
     repo.index.load()
     return sorted(
@@ -38,10 +46,9 @@ def test_it_adds_executable_file_to_the_index(
 
 
 def test_it_adds_multiple_files_to_the_index(
-    write_file: WriteFile, legit_cmd: LegitCmd, repo: Repository
+    write_files: WriteFiles, legit_cmd: LegitCmd, repo: Repository
 ) -> None:
-    write_file("hello.txt", "hello")
-    write_file("world.txt", "world")
+    write_files({"hello.txt": "hello", "world.txt": "world"})
     cmd, *_ = legit_cmd("add", "hello.txt", "world.txt")
     assert cmd.status == 0
     assert get_index(repo) == [
@@ -51,10 +58,9 @@ def test_it_adds_multiple_files_to_the_index(
 
 
 def test_it_incrementally_adds_files_to_the_index(
-    write_file: WriteFile, legit_cmd: LegitCmd, repo: Repository
+    write_files: WriteFiles, legit_cmd: LegitCmd, repo: Repository
 ) -> None:
-    write_file("hello.txt", "hello")
-    write_file("world.txt", "world")
+    write_files({"hello.txt": "hello", "world.txt": "world"})
 
     _ = legit_cmd("add", "world.txt")
     assert get_index(repo) == [(0o100644, "world.txt")]
@@ -1,32 +1,58 @@
+from pathlib import Path
 from typing import cast
 
 import pytest
 
 from legit.commit import Commit as CommitObj
+from legit.refs import Refs
 from legit.repository import Repository
-from tests.cmd_helpers import assert_status, assert_stderr, assert_stdout
-from tests.conftest import Commit, LegitCmd, LoadCommit, ResolveRevision, WriteFile
+from tests.cmd_helpers import (
+    assert_status,
+    assert_stderr,
+    assert_stdout,
+    store_commits,
+)
+from tests.conftest import (
+    Commit,
+    LegitCmd,
+    ResolveRevision,
+    SnapshotCmd,
+    WriteFile,
+)
 
+AUTHOR_ENV = {"GIT_AUTHOR_NAME": "A. U. Thor", "GIT_AUTHOR_EMAIL": "author@example.com"}
 
+
+@pytest.fixture
+def cmd_repo(repo: Repository) -> Repository:
+    return repo
+
+
+def build_chain(path: Path, legit_cmd: SnapshotCmd) -> None:
+    # Only the history matters here, so the commits are stored directly
+    # instead of going through the workspace and index.
+    repo = Repository(path / ".git")
+    store_commits(repo, ["first", "second", "third"])
+    repo.close()
+
+
+@pytest.mark.snapshot.with_args(build_chain)
 class TestBranchWithChainOfCommitObjs:
     @pytest.fixture(autouse=True)
-    def setup(self, write_file: WriteFile, legit_cmd: LegitCmd, commit: Commit) -> None:
-        messages = ["first", "second", "third"]
-        for msg in messages:
-            write_file("file.txt", msg)
-            legit_cmd("add", ".")
-            commit(msg)
+    def setup(self, repo: Repository) -> None:
+        self.commits: list[CommitObj] = []
+
+        oid = repo.refs.read_head()
+        while oid is not None:
+            commit = cast(CommitObj, repo.database.load(oid))
+            self.commits.insert(0, commit)
+            oid = commit.parent
 
     def test_it_creates_a_branch_pointing_at_head(
         self, repo: Repository, legit_cmd: LegitCmd
     ) -> None:
-        head_sha = repo.refs.read_head()
         _ = legit_cmd("branch", "topic")
-        assert repo.refs.read_ref("topic") == head_sha
-
-    def test_it_fails_for_invalid_branch_names(self, legit_cmd: LegitCmd) -> None:
-        _, _, _, stderr = legit_cmd("branch", "^")
-        assert_stderr(stderr, "fatal: '^' is not a valid branch name.\n")
+        assert repo.refs.read_ref("topic") == self.commits[-1].oid
 
     def test_it_fails_for_existing_branch_names(self, legit_cmd: LegitCmd) -> None:
         _ = legit_cmd("branch", "topic")
@@ -36,23 +62,14 @@ class TestBranchWithChainOfCommitObjs:
     def test_it_creates_a_branch_pointing_at_heads_parent(
         self, repo: Repository, legit_cmd: LegitCmd
     ) -> None:
-        head_sha = cast(str, repo.refs.read_head())
-        head_commit = cast(CommitObj, repo.database.load(head_sha))
-        parent_sha = head_commit.parent
         _ = legit_cmd("branch", "topic", "HEAD^")
-        assert repo.refs.read_ref("topic") == parent_sha
+        assert repo.refs.read_ref("topic") == self.commits[-2].oid
 
     def test_it_creates_a_branch_pointing_at_heads_grandparent(
         self, repo: Repository, legit_cmd: LegitCmd
     ) -> None:
-        head_sha = cast(str, repo.refs.read_head())
-        head_commit = cast(CommitObj, repo.database.load(head_sha))
-        parent_commit = cast(
-            CommitObj, repo.database.load(cast(str, head_commit.parent))
-        )
-        grandparent_sha = parent_commit.parent
         _ = legit_cmd("branch", "topic", "@~2")
-        assert repo.refs.read_ref("topic") == grandparent_sha
+        assert repo.refs.read_ref("topic") == self.commits[-3].oid
 
     def test_it_creates_a_branch_relative_to_another_one(
         self,
@@ -75,28 +92,30 @@ class TestBranchWithChainOfCommitObjs:
         _ = legit_cmd("branch", "topic", repo.database.short_oid(commit_id))
         assert repo.refs.read_ref("topic") == commit_id
 
-    def test_it_fails_for_invalid_revisions(self, legit_cmd: LegitCmd) -> None:
-        *_, stderr = legit_cmd("branch", "topic", "^")
-        assert_stderr(stderr, "fatal: Not a valid object name: '^'.\n")
-
-    def test_it_fails_for_invalid_refs(self, legit_cmd: LegitCmd) -> None:
-        *_, stderr = legit_cmd("branch", "topic", "no-such-branch")
-        assert_stderr(stderr, "fatal: Not a valid object name: 'no-such-branch'.\n")
-
-    def test_it_fails_for_invalid_parents(self, legit_cmd: LegitCmd) -> None:
-        *_, stderr = legit_cmd("branch", "topic", "HEAD^^^^")
-        assert_stderr(stderr, "fatal: Not a valid object name: 'HEAD^^^^'.\n")
-
-    def test_it_fails_for_invalid_ancestors(self, legit_cmd: LegitCmd) -> None:
-        *_, stderr = legit_cmd("branch", "topic", "HEAD~50")
-        assert_stderr(stderr, "fatal: Not a valid object name: 'HEAD~50'.\n")
+    @pytest.mark.parametrize(
+        "argv, expected",
+        [
+            (["^"], "fatal: '^' is not a valid branch name.\n"),
+            (["topic", "^"], "fatal: Not a valid object name: '^'.\n"),
+            (
+                ["topic", "no-such-branch"],
+                "fatal: Not a valid object name: 'no-such-branch'.\n",
+            ),
+            (["topic", "HEAD^^^^"], "fatal: Not a valid object name: 'HEAD^^^^'.\n"),
+            (["topic", "HEAD~50"], "fatal: Not a valid object name: 'HEAD~50'.\n"),
+        ],
+        ids=["branch-names", "revisions", "refs", "parents", "ancestors"],
+    )
+    def test_it_fails_for_invalid_inputs(
+        self, legit_cmd: LegitCmd, argv: list[str], expected: str
+    ) -> None:
+        *_, stderr = legit_cmd("branch", *argv)
+        assert_stderr(stderr, expected)
 
     def test_it_fails_for_revisions_that_are_not_commits(
-        self, repo: Repository, legit_cmd: LegitCmd
+        self, legit_cmd: LegitCmd
     ) -> None:
-        tree_id = cast(
-            CommitObj, repo.database.load(cast(str, repo.refs.read_head()))
-        ).tree
+        tree_id = self.commits[-1].tree
         *_, stderr = legit_cmd("branch", "topic", tree_id)
         expected = (
             f"error: object {tree_id} is a tree, not a commit\n"
@@ -105,13 +124,9 @@ class TestBranchWithChainOfCommitObjs:
         assert_stderr(stderr, expected)
 
     def test_it_fails_for_parents_of_revisions_that_are_not_commits(
-        self,
-        repo: Repository,
-        legit_cmd: LegitCmd,
+        self, legit_cmd: LegitCmd
     ) -> None:
-        tree_id = cast(
-            CommitObj, repo.database.load(cast(str, repo.refs.read_head()))
-        ).tree
+        tree_id = self.commits[-1].tree
         spec = f"{tree_id}^^"
         *_, stderr = legit_cmd("branch", "topic", spec)
         expected = (
@@ -126,13 +141,9 @@ class TestBranchWithChainOfCommitObjs:
         assert_stdout(stdout, "* master\n  new-feature\n")
 
     def test_it_lists_existing_branches_with_verbose_info(
-        self,
-        repo: Repository,
-        legit_cmd: LegitCmd,
-        load_commit: LoadCommit,
+        self, repo: Repository, legit_cmd: LegitCmd
     ) -> None:
-        a = cast(CommitObj, load_commit("@^"))
-        b = cast(CommitObj, load_commit("@"))
+        *_, a, b = self.commits
         (*_,) = legit_cmd("branch", "new-feature", "@^")
         *_, stdout, _ = legit_cmd("branch", "--verbose")
         expected = (
@@ -142,7 +153,7 @@ class TestBranchWithChainOfCommitObjs:
         assert_stdout(stdout, expected)
 
     def test_it_deletes_a_branch(self, repo: Repository, legit_cmd: LegitCmd) -> None:
-        head = cast(str, repo.refs.read_head())
+        head = self.commits[-1].oid
         _ = legit_cmd("branch", "bug-fix")
         *_, stdout, _ = legit_cmd("branch", "--delete", "bug-fix")
 
@@ -159,30 +170,32 @@ class TestBranchWithChainOfCommitObjs:
         assert_stderr(stderr, "error: branch 'no-such-branch' not found.\n")
 
 
-class TestBranchWhenDiverged:
-    @pytest.fixture(autouse=True)
-    def setup(self, write_file: WriteFile, legit_cmd: LegitCmd, commit: Commit) -> None:
-        for msg in ["first", "second", "third"]:
-            write_file("file.txt", msg)
-            legit_cmd("add", ".")
-            commit(msg)
+def commit_file(path: Path, legit_cmd: SnapshotCmd, message: str) -> None:
+    (path / "file.txt").write_text(message)
+    legit_cmd("add", ".")
+    legit_cmd("commit", "-m", message, env=AUTHOR_ENV)
 
-        legit_cmd("branch", "topic")
-        legit_cmd("checkout", "topic")
 
-        write_file("file.txt", "changed")
+def build_diverged(path: Path, legit_cmd: SnapshotCmd) -> None:
+    for msg in ["first", "second", "third"]:
+        commit_file(path, legit_cmd, msg)
 
-        legit_cmd("add", ".")
-        commit("changed")
+    legit_cmd("branch", "topic")
+    legit_cmd("checkout", "topic")
+    commit_file(path, legit_cmd, "changed")
+    legit_cmd("checkout", "master")
 
-        legit_cmd("checkout", "master")
 
+@pytest.mark.snapshot.with_args(build_diverged)
+class TestBranchWhenDiverged:
     def test_it_deletes_a_merged_branch(
         self, repo: Repository, legit_cmd: LegitCmd
     ) -> None:
         head = cast(str, repo.refs.read_head())
 
-        legit_cmd("checkout", "topic")
+        # Only HEAD's target matters for deletion, so skip the checkout's
+        # workspace and index update.
+        repo.refs.set_head("topic", cast(str, repo.refs.read_ref("topic")))
         cmd, _, stdout, _ = legit_cmd("branch", "--delete", "master")
 
         assert_status(cmd, 0)
@@ -207,35 +220,29 @@ class TestBranchWhenDiverged:
         assert_stdout(stdout, expected)
 
 
-class TestBranchTrackingRemote:
-    @pytest.fixture(autouse=True)
-    def setup(
-        self,
-        write_file: WriteFile,
-        legit_cmd: LegitCmd,
-        commit: Commit,
-        repo: Repository,
-    ) -> None:
-        legit_cmd("remote", "add", "origin", "ssh://example.com/repo")
-        self.upstream = "refs/remotes/origin/master"
+UPSTREAM = "refs/remotes/origin/master"
+
+
+def build_tracking_remote(path: Path, legit_cmd: SnapshotCmd) -> None:
+    legit_cmd("remote", "add", "origin", "ssh://example.com/repo")
 
-        for msg in ["first", "second", "remote"]:
-            write_file("file.txt", msg)
-            legit_cmd("add", ".")
-            commit(msg)
+    for msg in ["first", "second", "remote"]:
+        commit_file(path, legit_cmd, msg)
 
-        repo.refs.update_ref(self.upstream, cast(str, repo.refs.read_head()))
+    refs = Refs(path / ".git")
+    refs.update_ref(UPSTREAM, cast(str, refs.read_head()))
 
-        legit_cmd("reset", "--hard", "@^")
-        for msg in ["third", "local"]:
-            write_file("file.txt", msg)
-            legit_cmd("add", ".")
-            commit(msg)
+    legit_cmd("reset", "--hard", "@^")
+    for msg in ["third", "local"]:
+        commit_file(path, legit_cmd, msg)
 
+
+@pytest.mark.snapshot.with_args(build_tracking_remote)
+class TestBranchTrackingRemote:
+    @pytest.fixture(autouse=True)
+    def setup(self, repo: Repository) -> None:
+        self.upstream = UPSTREAM
         self.head = repo.database.short_oid(cast(str, repo.refs.read_head()))
-        self.remote = repo.database.short_oid(
-            cast(str, repo.refs.read_ref(self.upstream))
-        )
 
     def test_it_displays_no_divergence_for_unlinked_branches(
         self, legit_cmd: LegitCmd
@@ -245,61 +252,45 @@ class TestBranchTrackingRemote:
         expected = f"* master {self.head} local\n"
         assert_stdout(stdout, expected)
 
-    def test_it_displays_divergence_for_linked_branches(
-        self, legit_cmd: LegitCmd
-    ) -> None:
-        legit_cmd("branch", "--set-upstream-to", "origin/master")
-        *_, stdout, _ = legit_cmd("branch", "--verbose")
-
-        expected = f"* master {self.head} [ahead 2, behind 1] local\n"
-        assert_stdout(stdout, expected)
-
-    def test_it_displays_branch_ahead_of_upstream(
-        self,
-        repo: Repository,
-        legit_cmd: LegitCmd,
-        resolve_revision: ResolveRevision,
-    ) -> None:
-        repo.refs.update_ref(self.upstream, resolve_revision("master~2"))
-
-        legit_cmd("branch", "--set-upstream-to", "origin/master")
-        *_, stdout, _ = legit_cmd("branch", "--verbose")
-
-        expected = f"* master {self.head} [ahead 2] local\n"
-        assert_stdout(stdout, expected)
-
-    def test_it_displays_branch_behind_upstream(
+    @pytest.mark.parametrize(
+        "upstream_at, reset_args, flag, expected_head, tail",
+        [
+            (None, [], "--verbose", "@", "[ahead 2, behind 1] local"),
+            ("master~2", [], "--verbose", "@", "[ahead 2] local"),
+            (None, ["@~2"], "--verbose", "@~2", "[behind 1] second"),
+            (None, [], "-vv", "@", "[origin/master, ahead 2, behind 1] local"),
+            (
+                None,
+                ["--hard", "origin/master"],
+                "-vv",
+                "origin/master",
+                "[origin/master] remote",
+            ),
+        ],
+        ids=["diverged", "ahead", "behind", "upstream-name", "up-to-date"],
+    )
+    def test_it_displays_upstream_tracking(
         self,
         repo: Repository,
         legit_cmd: LegitCmd,
         resolve_revision: ResolveRevision,
+        upstream_at: str | None,
+        reset_args: list[str],
+        flag: str,
+        expected_head: str,
+        tail: str,
     ) -> None:
-        master = resolve_revision("@~2")
-        oid = repo.database.short_oid(master)
-
-        legit_cmd("reset", master)
-        legit_cmd("branch", "--set-upstream-to", "origin/master")
-        *_, stdout, _ = legit_cmd("branch", "--verbose")
+        oid = repo.database.short_oid(resolve_revision(expected_head))
 
-        expected = f"* master {oid} [behind 1] second\n"
-        assert_stdout(stdout, expected)
+        if upstream_at is not None:
+            repo.refs.update_ref(self.upstream, resolve_revision(upstream_at))
+        if reset_args:
+            legit_cmd("reset", *reset_args)
 
-    def test_it_displays_upstream_branch_name(self, legit_cmd: LegitCmd) -> None:
         legit_cmd("branch", "--set-upstream-to", "origin/master")
-        *_, stdout, _ = legit_cmd("branch", "-vv")
+        *_, stdout, _ = legit_cmd("branch", flag)
 
-        expected = f"* master {self.head} [origin/master, ahead 2, behind 1] local\n"
-        assert_stdout(stdout, expected)
-
-    def test_it_displays_upstream_name_with_no_divergence(
-        self, legit_cmd: LegitCmd
-    ) -> None:
-        legit_cmd("reset", "--hard", "origin/master")
-        legit_cmd("branch", "--set-upstream-to", "origin/master")
-        *_, stdout, _ = legit_cmd("branch", "-vv")
-
-        expected = f"* master {self.remote} [origin/master] remote\n"
-        assert_stdout(stdout, expected)
+        assert_stdout(stdout, f"* master {oid} {tail}\n")
 
     def test_it_fails_if_upstream_ref_does_not_exist(self, legit_cmd: LegitCmd) -> None:
         cmd, *_, stderr = legit_cmd("branch", "--set-upstream-to", "origin/nope")
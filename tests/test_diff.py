@@ -1,5 +1,9 @@
+import pytest
+
 from legit.diff import diff_hunks
 
+pytestmark = pytest.mark.no_repo
+
 
 def hunks(a: list[str], b: list[str]) -> list[list[str | list[str]]]:
     return [
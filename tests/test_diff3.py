@@ -1,7 +1,11 @@
 import textwrap
 
+import pytest
+
 from legit.diff3 import Diff3
 
+pytestmark = pytest.mark.no_repo
+
 
 def test_it_cleanly_merges_two_lists() -> None:
     merge = Diff3.merge(["a", "b", "c"], ["d", "b", "c"], ["a", "b", "e"])
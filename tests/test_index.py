@@ -4,8 +4,11 @@ from pathlib import Path
 
 import pytest
 
+from legit.db_entry import DatabaseEntry
 from legit.index import Index
 
+pytestmark = pytest.mark.no_repo
+
 
 @pytest.fixture
 def index_path(tmp_path: Path) -> Path:
@@ -74,3 +77,81 @@ def test_it_recursively_replaces_directory_with_a_file(
         str(entry.path)
         for entry in sorted(index.entries.values(), key=lambda x: x.path)
     ] == ["alice.txt", "nested"]
+
+
+def write_index(index: Index, oid: str, stat: os.stat_result) -> None:
+    index.load_for_update()
+    index.add(Path("alice.txt"), oid, stat)
+    index.write_updates()
+
+
+def test_it_reuses_entries_when_the_file_is_unchanged(
+    index: Index, index_path: Path, oid: str, stat: os.stat_result
+) -> None:
+    write_index(index, oid, stat)
+    os.utime(index_path, ns=(0, 0))
+
+    index.load()
+    entries = index.entries
+    index.load()
+
+    assert index.entries is entries
+
+
+def test_it_reloads_entries_after_local_changes(
+    index: Index, index_path: Path, oid: str, stat: os.stat_result
+) -> None:
+    write_index(index, oid, stat)
+    os.utime(index_path, ns=(0, 0))
+
+    index.load()
+    index.add(Path("bob.txt"), oid, stat)
+    index.load()
+
+    assert [str(entry.path) for entry in index.entries.values()] == ["alice.txt"]
+
+
+def test_it_reloads_entries_written_by_another_index(
+    index: Index, index_path: Path, oid: str, stat: os.stat_result
+) -> None:
+    write_index(index, oid, stat)
+    os.utime(index_path, ns=(0, 0))
+    index.load()
+
+    other = Index(index_path)
+    other.load_for_update()
+    other.add(Path("bob.txt"), oid, stat)
+    other.write_updates()
+    index.load()
+
+    assert [str(entry.path) for entry in index.entries.values()] == [
+        "alice.txt",
+        "bob.txt",
+    ]
+
+
+def test_it_returns_entries_in_path_order(
+    index: Index, oid: str, stat: os.stat_result
+) -> None:
+    index.add(Path("bob.txt"), oid, stat)
+    index.add(Path("carol.txt"), oid, stat)
+    index.add(Path("alice/nested.txt"), oid, stat)
+
+    assert [str(entry.path) for entry in index.sorted_entries()] == [
+        "alice/nested.txt",
+        "bob.txt",
+        "carol.txt",
+    ]
+
+
+def test_it_refreshes_cached_conflicts_when_entries_change(
+    index: Index, oid: str, stat: os.stat_result
+) -> None:
+    index.add(Path("alice.txt"), oid, stat)
+    assert index.conflict_paths_cached() == set()
+
+    index.add_conflict_set(
+        Path("alice.txt"), [DatabaseEntry(oid, 0o100644), None, None]
+    )
+
+    assert [str(entry.path) for entry in index.conflict_paths_cached()] == ["alice.txt"]
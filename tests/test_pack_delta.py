@@ -1,5 +1,5 @@
 import io
-import secrets
+import random
 from pathlib import Path
 from typing import Optional, Type, cast
 
@@ -17,7 +17,9 @@ from legit.pack_writer import Writer
 from legit.pack_xdelta import XDelta
 from legit.rev_list import RevList
 
-blob_text_1: str = secrets.token_hex(256)
+pytestmark = pytest.mark.no_repo
+
+blob_text_1: str = random.Random(0xC0DE).randbytes(256).hex()
 blob_text_2: str = blob_text_1 + "new_content"
 
 
@@ -43,13 +45,11 @@ tests: dict[str, Type[Unpacker | Indexer]] = {
 }
 
 
-@pytest.mark.parametrize("allow_ofs", [False, True], ids=lambda b: f"ofs_delta={b}")
-@pytest.mark.parametrize("name, processor", tests.items())
-def test_pack_processing(
-    name: str, processor: Type[Indexer | Unpacker], allow_ofs: bool, tmp_path: Path
-) -> None:
-    source_db = create_db(tmp_path, "db-source")
-    target_db = create_db(tmp_path, "db-target")
+@pytest.fixture(scope="session", params=[False, True], ids=lambda b: f"ofs_delta={b}")
+def packed_blobs(
+    request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory
+) -> tuple[bytes, list[str]]:
+    source_db = create_db(tmp_path_factory.mktemp("pack"), "db-source")
 
     blobs_to_pack: list[tuple[DatabaseEntry, Optional[Path]]] = []
     for data in [blob_text_1, blob_text_2]:
@@ -60,20 +60,30 @@ def test_pack_processing(
 
     pack_data = io.BytesIO()
 
-    writer = Writer(pack_data, source_db, {"allow_ofs": allow_ofs})
+    writer = Writer(pack_data, source_db, {"allow_ofs": request.param})
     writer.write_objects(cast(RevList, blobs_to_pack))
-    pack_data.seek(0)
+    source_db.close()
+
+    return pack_data.getvalue(), [entry.oid for entry, _ in blobs_to_pack]
 
-    stream = Stream(pack_data)
+
+@pytest.mark.parametrize("name, processor", tests.items())
+def test_pack_processing(
+    name: str,
+    processor: Type[Indexer | Unpacker],
+    packed_blobs: tuple[bytes, list[str]],
+    tmp_path: Path,
+) -> None:
+    pack, oids = packed_blobs
+    target_db = create_db(tmp_path, "db-target")
+
+    stream = Stream(io.BytesIO(pack))
     reader = Reader(stream)
     reader.read_header()
     proc_instance = processor(target_db, reader, stream, None)
     proc_instance.process_pack()
 
-    target_db.close()
-    target_db = create_db(tmp_path, "db-target")
-
-    oids = [b[0].oid for b in blobs_to_pack]
+    target_db.reload()
 
     loaded_blobs = [cast(Blob, target_db.load(oid)) for oid in oids]
 
@@ -85,5 +95,4 @@ def test_pack_processing(
     assert infos[0] == Raw("blob", 512, None)
     assert infos[1] == Raw("blob", 523, None)
 
-    source_db.close()
     target_db.close()
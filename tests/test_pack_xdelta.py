@@ -1,6 +1,10 @@
+import pytest
+
 from legit.pack_delta import Delta
 from legit.pack_xdelta import XDelta
 
+pytestmark = pytest.mark.no_repo
+
 #   0               16               32               48
 #   +----------------+----------------+----------------+
 #   |the quick brown |fox jumps over t|he slow lazy dog|
@@ -1,7 +1,11 @@
 from typing import Union
 
+import pytest
+
 from legit.revision import Revision
 
+pytestmark = pytest.mark.no_repo
+
 
 def assert_parse(
     expression: str,
@@ -9,11 +9,14 @@ from legit.db_entry import DatabaseEntry
 from legit.index import Entry
 from legit.tree import Tree
 
+pytestmark = pytest.mark.no_repo
+
 
 class FakeEntry:
     def __init__(self, path: str, oid: str, mode: int) -> None:
         self.path = path
         self.oid = oid
+        self.raw_oid = bytes.fromhex(oid)
         self.mode_bits = mode
 
     def parent_directories(self) -> list[Path]: